@@ -0,0 +1,266 @@
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from app.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Process-wide, so a version is never reused, even across caches
+_versions = itertools.count(1)
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "version")
+
+    def __init__(self, value, loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.version = next(_versions)
+
+
+class TTLCache:
+    """LRU cache with a soft TTL and stale-while-revalidate.
+
+    Fresh entries are returned as-is. Entries older than ``ttl`` are still
+    returned immediately, and a background refresh is started for them.
+    Entries older than ``ttl + max_stale`` (when set) are reloaded inline.
+    Loads for the same key are coalesced and errors are never cached.
+
+    An optional persistent ``store`` (see app.stats_store) is consulted on
+    a miss before calling the loader, and written through on every load.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600.0,
+        max_stale: Optional[float] = None,
+        refresh_workers: int = 4,
+        store=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.store = store
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshing = set()
+        self._pool = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="cache-refresh"
+        )
+        self.hits = self.misses = self.stale = self.store_hits = 0
+        self.evictions = self.refresh_errors = 0
+
+    def get(self, key: Hashable, fn: Callable[..., Any], *args) -> Any:
+        return self._get(key, fn, args).value
+
+    def get_versioned(
+        self, key: Hashable, fn: Callable[..., Any], *args
+    ) -> Tuple[Any, int]:
+        """``get`` plus a version number that changes whenever the value does."""
+        entry = self._get(key, fn, args)
+        return entry.value, entry.version
+
+    def _get(self, key, fn, args) -> _Entry:
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                age = now - entry.loaded_at
+                if self._too_old(age):
+                    entry = None
+                else:
+                    self._data.move_to_end(key)
+
+            if entry is None:
+                self.misses += 1
+            elif age < self.ttl:
+                self.hits += 1
+                return entry
+            else:
+                self.stale += 1
+                refresh = key not in self._refreshing
+                if refresh:
+                    self._refreshing.add(key)
+
+        if entry is None:
+            return self._flight.do(key, self._load_missing, key, fn, args)
+
+        if refresh:
+            self._pool.submit(self._refresh, key, fn, args)
+        return entry
+
+    def __contains__(self, key: Hashable) -> bool:
+        """True if ``get`` would answer from memory, without calling the loader."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._too_old(
+                self._clock() - entry.loaded_at
+            )
+
+    def _load_missing(self, key, fn, args):
+        stored = self._read_store(key)
+        if stored is None:
+            return self._load(key, fn, args)
+
+        value, age = stored
+        with self._lock:
+            self.store_hits += 1
+            entry = self._put(key, value, self._clock() - age)
+            refresh = age >= self.ttl and key not in self._refreshing
+            if refresh:
+                self._refreshing.add(key)
+        if refresh:
+            self._pool.submit(self._refresh, key, fn, args)
+        return entry
+
+    def _read_store(self, key):
+        if self.store is None:
+            return None
+        try:
+            stored = self.store.get(key)
+        except Exception:
+            logger.exception("Persistent cache read failed for %r", key)
+            return None
+        if stored is not None and self._too_old(stored[1]):
+            return None
+        return stored
+
+    def _too_old(self, age: float) -> bool:
+        return self.max_stale is not None and age >= self.ttl + self.max_stale
+
+    def _load(self, key, fn, args) -> _Entry:
+        return self._insert([(key, fn(*args))])[0]
+
+    def _refresh(self, key, fn, args):
+        try:
+            # _refreshing already limits this to one refresh per key
+            self._load(key, fn, args)
+        except Exception:
+            # Keep serving the stale value; the next stale hit retries
+            with self._lock:
+                self.refresh_errors += 1
+            logger.exception("Background refresh failed for %r", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._put(key, value, self._clock())
+
+    def put_many(self, items):
+        """Insert fresh ``(key, value)`` pairs and write them through."""
+        self._insert(list(items))
+
+    def _insert(self, items) -> list:
+        now = self._clock()
+        with self._lock:
+            entries = [self._put(key, value, now) for key, value in items]
+        if self.store is not None and items:
+            try:
+                self.store.set_many(items)
+            except Exception:
+                logger.exception("Persistent cache write failed (%d keys)", len(items))
+        return entries
+
+    def _put(self, key, value, loaded_at: float) -> _Entry:
+        entry = self._data[key] = _Entry(value, loaded_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "store_hits": self.store_hits,
+                "evictions": self.evictions,
+                "refresh_errors": self.refresh_errors,
+            }
+
+
+class DerivedCache:
+    """LRU of values derived from another cache's entries.
+
+    Each value remembers the version of the source entry it was built from
+    (see ``TTLCache.get_versioned``) and is only returned while the source
+    still has that version. It is never fresher or staler than its source,
+    and a refreshed source is picked up on the next lookup. Only the
+    version is kept, so an evicted source can be freed while values built
+    from it stay cached. Builds for the same key are coalesced.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable, version: int, fn: Callable[..., Any], *args) -> Any:
+        """Value for ``key`` at source ``version``, calling ``fn(*args)`` if needed."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == version:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self._flight.do(key, self._build, key, version, fn, args)
+
+    def _build(self, key, version, fn, args):
+        value = fn(*args)
+        with self._lock:
+            self._data[key] = (version, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,26 @@
+from typing import Optional
+
+from app.resultsets import Table
+from app.stats_store import LATEST_SEASON
+
+# A player's career totals Table, one row per season (oldest first). Plain
+# lists keep it JSON-ready for the persistent cache and the /career response.
+Career = Table
+
+
+def season_totals(career: Career, season: str) -> Optional[dict]:
+    """One season's totals row, or None if the player has none.
+
+    A traded player's season spans several rows; the last one (TOT) wins.
+    """
+    seasons = career.get("SEASON_ID", [])
+    if not seasons:
+        return None
+    if season == LATEST_SEASON:
+        i = len(seasons) - 1
+    else:
+        matches = [i for i, value in enumerate(seasons) if value == season]
+        if not matches:
+            return None
+        i = matches[-1]
+    return {name: values[i] for name, values in career.items()}
@@ -0,0 +1,66 @@
+import os
+
+
+def _float_env(name: str, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# Stats cache: entries are fresh for STATS_TTL_SECONDS, then served stale
+# while a background refresh runs. Unset STATS_MAX_STALE_SECONDS keeps
+# serving stale data until the entry is evicted.
+STATS_TTL_SECONDS = _float_env("STATS_TTL_SECONDS", 3600.0)
+STATS_MAX_STALE_SECONDS = _float_env("STATS_MAX_STALE_SECONDS", None)
+# Derived stats records per (player, season); each is ~200 bytes
+STATS_CACHE_SIZE = int(os.environ.get("STATS_CACHE_SIZE", "32768"))
+# Upstream career tables, one per player
+CAREER_CACHE_SIZE = int(os.environ.get("CAREER_CACHE_SIZE", "4096"))
+# Encoded /player bodies for the hottest (player, season) pairs
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "4096"))
+
+# Response encoding: "orjson" (falls back to "json" when orjson isn't
+# installed) or "json" for the stdlib encoder
+JSON_ENCODER = os.environ.get("JSON_ENCODER", "orjson")
+
+# Persistent (SQLite) stats cache under the in-memory one; empty disables it
+STATS_DB_FILE = os.environ.get("STATS_DB_FILE", "stats_cache.db")
+
+# Usage log (SQLite). Rows are queued and written in batches of up to
+# USAGE_BATCH_SIZE, at most USAGE_FLUSH_MS after they were logged; beyond
+# USAGE_QUEUE_SIZE pending rows new ones are dropped.
+USAGE_DB_FILE = os.environ.get("USAGE_DB_FILE", "usage_tracking.db")
+USAGE_BATCH_SIZE = int(os.environ.get("USAGE_BATCH_SIZE", "500"))
+USAGE_FLUSH_MS = _float_env("USAGE_FLUSH_MS", 200.0)
+USAGE_QUEUE_SIZE = int(os.environ.get("USAGE_QUEUE_SIZE", "100000"))
+# How long a write waits for another worker's lock before failing
+USAGE_BUSY_TIMEOUT_MS = _float_env("USAGE_BUSY_TIMEOUT_MS", 5000.0)
+
+# Usage log retention (app.retention), every USAGE_RETENTION_INTERVAL_SECONDS
+# (0 disables): raw rows are kept for USAGE_RAW_RETENTION_HOURS, hourly
+# rollups for USAGE_HOURLY_RETENTION_DAYS before being merged into days,
+# daily ones for USAGE_DAILY_RETENTION_DAYS.
+# Deletes run USAGE_RETENTION_BATCH rows per transaction.
+USAGE_RETENTION_INTERVAL_SECONDS = _float_env("USAGE_RETENTION_INTERVAL_SECONDS", 0.0)
+USAGE_RAW_RETENTION_HOURS = _float_env("USAGE_RAW_RETENTION_HOURS", 168.0)
+USAGE_HOURLY_RETENTION_DAYS = _float_env("USAGE_HOURLY_RETENTION_DAYS", 30.0)
+USAGE_DAILY_RETENTION_DAYS = _float_env("USAGE_DAILY_RETENTION_DAYS", 365.0)
+USAGE_RETENTION_BATCH = int(os.environ.get("USAGE_RETENTION_BATCH", "5000"))
+
+# Worker threads for fetching several players at once (/compare, /lineup)
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", "8"))
+
+# Where stats come from: "nba_api" (live) or "fixtures" (offline payloads
+# under STATS_FIXTURES_DIR, synthesized for players without one)
+STATS_PROVIDER = os.environ.get("STATS_PROVIDER", "nba_api")
+STATS_FIXTURES_DIR = os.environ.get(
+    "STATS_FIXTURES_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", "fixtures"),
+)
+# Artificial per-call latency for the fixture provider, to model upstream
+STATS_FIXTURE_DELAY_MS = _float_env("STATS_FIXTURE_DELAY_MS", 0.0)
+
+# League-wide ingestion: one bulk request per INGEST_INTERVAL_SECONDS fills
+# the stats cache for every player in CURRENT_SEASON (default: nba_api's
+# current season). 0 disables the background job.
+INGEST_INTERVAL_SECONDS = _float_env("INGEST_INTERVAL_SECONDS", 0.0)
+CURRENT_SEASON = os.environ.get("CURRENT_SEASON", "")
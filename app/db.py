@@ -1,42 +1,267 @@
+import logging
+import os
+import queue
 import sqlite3
-from datetime import datetime
-
-DB_FILE = "usage_tracking.db"
-
-
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS usage_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            endpoint TEXT NOT NULL,
-            payload TEXT,
-            timestamp TEXT NOT NULL
-        )
-    """
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app import config
+from app.migrations import migrate
+
+logger = logging.getLogger(__name__)
+
+DB_FILE = config.USAGE_DB_FILE
+
+# The schema lives in app.migrations; this module only reads and appends.
+# Statements are fixed strings, so sqlite3 prepares each one once per
+# connection and reuses it from its statement cache.
+INSERT_USAGE = "INSERT INTO usage_log (timestamp, endpoint, payload) VALUES (?, ?, ?)"
+
+UPSERT_ROLLUP = """
+    INSERT INTO usage_rollup (bucket, endpoint, payload, count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (bucket, endpoint, payload) DO UPDATE
+    SET count = count + excluded.count
+"""
+
+
+def hour_bucket(timestamp: str) -> str:
+    """Rollup bucket of an ISO timestamp: "2024-01-01T13"."""
+    return timestamp[:13]
+
+
+def rollup_counts(rows):
+    """Aggregate (timestamp, endpoint, payload) rows into rollup upserts."""
+    counts = Counter(
+        (hour_bucket(timestamp), endpoint, payload or "")
+        for timestamp, endpoint, payload in rows
     )
-    conn.commit()
-    conn.close()
+    return [key + (count,) for key, count in counts.items()]
 
 
-def log_usage(endpoint: str, payload: str):
-    conn = sqlite3.connect("usage_tracking.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS usage_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            endpoint TEXT,
-            payload TEXT
-        )
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open a usage database connection tuned for concurrent writers.
+
+    WAL lets readers and the writer proceed together, NORMAL synchronous
+    only fsyncs at checkpoints, and the busy timeout makes writers from
+    other workers wait for the lock instead of failing. New databases use
+    incremental auto-vacuum so app.retention can give space back.
     """
-    )
-    cursor.execute(
-        "INSERT INTO usage_log (timestamp, endpoint, payload) VALUES (?, ?, ?)",
-        (datetime.utcnow().isoformat(), endpoint, payload),
-    )
-    conn.commit()
-    conn.close()
+    conn = sqlite3.connect(path or DB_FILE, timeout=config.USAGE_BUSY_TIMEOUT_MS / 1000)
+    # Only takes effect before the first table is created
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(config.USAGE_BUSY_TIMEOUT_MS)}")
+    return conn
+
+
+# One long-lived connection per (thread, database file) in each worker
+_local = threading.local()
+
+
+def get_connection(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or DB_FILE
+    if getattr(_local, "pid", None) != os.getpid():
+        # New thread, or a forked worker: never reuse the parent's handles
+        _local.connections = {}
+        _local.pid = os.getpid()
+    connections = _local.connections
+    conn = connections.get(path)
+    if conn is None:
+        conn = connections[path] = connect(path)
+    return conn
+
+
+def close_connection(path: Optional[str] = None):
+    """Close this thread's connection to ``path``, if it has one."""
+    conn = getattr(_local, "connections", {}).pop(path or DB_FILE, None)
+    if conn is not None:
+        conn.close()
+
+
+def init_db(path: Optional[str] = None):
+    """Apply pending schema migrations (a version check once up to date)."""
+    migrate(get_connection(path))
+
+
+# Hourly buckets ("2024-01-01T13") from the cutoff hour on, plus daily ones
+# ("2024-01-01", merged by app.retention) from the cutoff day on
+SINCE = (
+    "((length(bucket) = 13 AND bucket >= ?) OR (length(bucket) = 10 AND bucket >= ?))"
+)
+
+
+def usage_summary(
+    hours: int = 24,
+    bucket: str = "hour",
+    top: int = 10,
+    path: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """Request counts for the last ``hours``, read from the rollup table.
+
+    Counts are per endpoint, for the ``top`` payloads and per ``bucket``
+    ("hour" or "day"). Hours already merged into days by retention show up
+    as whole days, with ``resolution`` "day" in the hourly series.
+    """
+    now = now or datetime.utcnow()
+    since = hour_bucket((now - timedelta(hours=hours)).isoformat())
+    window = (since, since[:10])
+    width = 13 if bucket == "hour" else 10
+    conn = get_connection(path)
+    endpoints = conn.execute(
+        f"SELECT endpoint, SUM(count) FROM usage_rollup WHERE {SINCE}"
+        " GROUP BY endpoint ORDER BY 2 DESC",
+        window,
+    ).fetchall()
+    payloads = conn.execute(
+        f"SELECT endpoint, payload, SUM(count) FROM usage_rollup WHERE {SINCE}"
+        " GROUP BY endpoint, payload ORDER BY 3 DESC LIMIT ?",
+        (*window, top),
+    ).fetchall()
+    buckets = conn.execute(
+        f"SELECT substr(bucket, 1, ?), SUM(count) FROM usage_rollup WHERE {SINCE}"
+        " GROUP BY 1 ORDER BY 1",
+        (width, *window),
+    ).fetchall()
+    return {
+        "since": since,
+        "total": sum(count for _, count in endpoints),
+        "endpoints": dict(endpoints),
+        "top_payloads": [
+            {"endpoint": endpoint, "payload": payload, "count": count}
+            for endpoint, payload, count in payloads
+        ],
+        "buckets": [
+            {
+                "bucket": key,
+                "resolution": "hour" if len(key) == 13 else "day",
+                "count": count,
+            }
+            for key, count in buckets
+        ],
+    }
+
+
+# Queue sentinel: write what's left, then exit
+_STOP = object()
+
+
+class UsageLogWriter:
+    """Queues usage rows and inserts them in batches from a background thread.
+
+    Each batch is one transaction, written once ``batch_size`` rows are
+    queued or ``flush_interval`` seconds after its first row. When the
+    queue is full rows are dropped (and counted) rather than blocking the
+    request that logged them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_queued: int = 100_000,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.written = self.dropped = self.errors = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="usage-log", daemon=True
+                )
+                self._thread.start()
+
+    def log(self, endpoint: str, payload: str):
+        if not self._running():
+            self.start()
+        try:
+            self._queue.put_nowait((datetime.utcnow().isoformat(), endpoint, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every row logged so far is written."""
+        if not self._running():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Write the remaining rows and stop the background thread."""
+        if not self._running():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        try:
+            init_db(self.path)  # no-op after the lifespan's init_db
+            conn = get_connection(self.path)
+            while True:
+                rows, waiters, stop = self._next_batch()
+                if rows:
+                    self._write(conn, rows)
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+        finally:
+            close_connection(self.path)
+
+    def _next_batch(self):
+        rows, waiters = [], []
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if item is _STOP:
+                return rows, waiters, True
+            if isinstance(item, threading.Event):
+                # A flush() call: write now instead of waiting out the batch
+                waiters.append(item)
+                return rows, waiters, False
+            rows.append(item)
+            timeout = deadline - time.monotonic()
+            if len(rows) >= self.batch_size or timeout <= 0:
+                return rows, waiters, False
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return rows, waiters, False
+
+    def _write(self, conn: sqlite3.Connection, rows):
+        try:
+            with conn:
+                conn.executemany(INSERT_USAGE, rows)
+                conn.executemany(UPSERT_ROLLUP, rollup_counts(rows))
+            self.written += len(rows)
+        except sqlite3.Error:
+            self.errors += 1
+            logger.exception("Failed to write %d usage rows", len(rows))
+
+
+usage_writer = UsageLogWriter(
+    DB_FILE,
+    batch_size=config.USAGE_BATCH_SIZE,
+    flush_interval=config.USAGE_FLUSH_MS / 1000,
+    max_queued=config.USAGE_QUEUE_SIZE,
+)
+
+
+def log_usage(endpoint: str, payload: str):
+    # Only queues the row; usage_writer's thread does the SQLite I/O
+    usage_writer.log(endpoint, payload)
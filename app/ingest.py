@@ -0,0 +1,46 @@
+import logging
+from typing import Optional
+
+from app.league_store import LeagueStore
+from app.periodic import PeriodicThread
+from app.providers import current_season, get_provider
+from app.team_stats import fetch_team_totals, team_cache
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_season(store: LeagueStore, season: Optional[str] = None) -> int:
+    """Load every player's ``season`` totals into ``store`` in one request.
+
+    Team totals for the season (needed for usage rate) are refreshed with
+    one more bulk request. Players the league table does not cover are
+    left to the regular per-player fetch. Returns the number of players
+    loaded.
+    """
+    season = season or current_season()
+    table = get_provider().league_totals(season)
+    team_cache.put_many([(season, fetch_team_totals(season))])
+    snapshot = store.load(season, table)
+    logger.info("Ingested %d players for %s", len(snapshot), season)
+    return len(snapshot)
+
+
+class IngestScheduler(PeriodicThread):
+    """Background thread running ``ingest_season`` every ``interval`` seconds."""
+
+    def __init__(
+        self, store: LeagueStore, interval: float, season: Optional[str] = None
+    ):
+        super().__init__(
+            "league-ingest", interval, ingest_season, store, season, run_first=True
+        )
+        self.store = store
+        self.season = season
+
+
+if __name__ == "__main__":
+    # One-off ingest that reports the store's memory use per player
+    logging.basicConfig(level=logging.INFO)
+    store = LeagueStore()
+    ingest_season(store)
+    print(store.memory_report())
@@ -0,0 +1,156 @@
+import sys
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Season-total columns kept per player, one contiguous float64 array each
+STAT_COLUMNS = (
+    "GP",
+    "MIN",
+    "FGM",
+    "FGA",
+    "FG_PCT",
+    "FG3M",
+    "FG3A",
+    "FG3_PCT",
+    "FTM",
+    "FTA",
+    "FT_PCT",
+    "OREB",
+    "DREB",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "PF",
+    "PTS",
+)
+
+
+class LeagueSnapshot:
+    """Immutable columnar view of one season's league totals."""
+
+    def __init__(
+        self,
+        season: str,
+        player_ids: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        teams: List[str],
+        version: int,
+        team_ids: Optional[np.ndarray] = None,
+    ):
+        self.season = season
+        self.player_ids = player_ids
+        if team_ids is None:
+            team_ids = np.zeros(len(player_ids), dtype=np.int64)
+        self.team_ids = team_ids
+        self.columns = columns
+        self.teams = teams
+        self.version = version
+        self.rows = {int(pid): i for i, pid in enumerate(player_ids)}
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def row(self, player_id: int) -> Optional[dict]:
+        i = self.rows.get(player_id)
+        if i is None:
+            return None
+        row = {name: float(column[i]) for name, column in self.columns.items()}
+        row["TEAM_ID"] = int(self.team_ids[i])
+        row["TEAM_ABBREVIATION"] = self.teams[i]
+        return row
+
+    def leaders(self, stat: str, limit: int = 10, min_games: int = 1) -> List[dict]:
+        """Top players by ``stat`` per game (percentages are taken as-is)."""
+        values = self.columns[stat]
+        gp = self.columns["GP"]
+        if not stat.endswith("_PCT"):
+            values = np.divide(values, gp, out=np.zeros_like(values), where=gp > 0)
+        values = np.where(gp >= max(min_games, 1), values, -np.inf)
+
+        limit = min(limit, len(values))
+        if limit == 0:
+            return []
+        top = np.argpartition(-values, limit - 1)[:limit]
+        top = top[np.argsort(-values[top], kind="stable")]
+        return [
+            {
+                "player_id": int(self.player_ids[i]),
+                "team": self.teams[i],
+                "value": round(float(values[i]), 3),
+            }
+            for i in top
+            if np.isfinite(values[i])
+        ]
+
+
+class LeagueStore:
+    """Columnar league stats store: player_id -> row, one array per stat.
+
+    ``load`` replaces the whole season in one step, so readers always see
+    a consistent snapshot; ``version`` changes on every load.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = LeagueSnapshot(
+            "", np.zeros(0, dtype=np.int64), _empty_columns(), [], 0
+        )
+
+    @property
+    def snapshot(self) -> LeagueSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def load(self, season: str, table) -> LeagueSnapshot:
+        """Replace the store with ``table`` (a league totals Table)."""
+        # Missing values (None) become NaN
+        columns = {
+            name: np.asarray(table[name], dtype=np.float64) for name in STAT_COLUMNS
+        }
+        player_ids = np.asarray(table["PLAYER_ID"], dtype=np.int64)
+        team_ids = np.asarray(table["TEAM_ID"], dtype=np.int64)
+        teams = [str(team) for team in table["TEAM_ABBREVIATION"]]
+        with self._lock:
+            version = self._snapshot.version + 1
+            self._snapshot = LeagueSnapshot(
+                season, player_ids, columns, teams, version, team_ids
+            )
+        return self._snapshot
+
+    def row(self, player_id: int) -> Optional[dict]:
+        return self._snapshot.row(player_id)
+
+    def column(self, name: str) -> np.ndarray:
+        return self._snapshot.columns[name]
+
+    def memory_report(self) -> dict:
+        """Bytes per player: columnar arrays vs. one dict of floats each."""
+        snapshot = self._snapshot
+        n = max(len(snapshot), 1)
+        columnar = sum(column.nbytes for column in snapshot.columns.values())
+        columnar += snapshot.player_ids.nbytes + snapshot.team_ids.nbytes
+        columnar += sys.getsizeof(snapshot.rows)
+
+        sample = {name: 0.0 for name in STAT_COLUMNS}
+        per_dict = sys.getsizeof(sample) + sum(
+            sys.getsizeof(float(i)) for i in range(len(STAT_COLUMNS))
+        )
+        return {
+            "players": len(snapshot),
+            "columnar_bytes_per_player": round(columnar / n, 1),
+            "dict_bytes_per_player": per_dict,
+        }
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {name: np.zeros(0, dtype=np.float64) for name in STAT_COLUMNS}
@@ -1,98 +1,337 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query
 from pydantic import BaseModel
-from nba_api.stats.endpoints import playercareerstats
-from nba_api.stats.static import players
-from functools import lru_cache
-from typing import Union, List, Optional
-from app.db import init_db, log_usage
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+from app import config
+from app.cache import DerivedCache, TTLCache
+from app.db import init_db, log_usage, usage_summary, usage_writer
+from app.ingest import IngestScheduler
+from app.league_store import STAT_COLUMNS, LeagueStore
+from app.metrics import derived_metrics
+from app.career import Career, season_totals
+from app.player_directory import get_directory
+from app.providers import get_provider
+from app.records import STAT_FIELDS, PlayerStatsRecord
+from app.retention import RetentionScheduler
+from app.response_cache import (
+    CachedBody,
+    ResponseCache,
+    etag_for,
+    validator_headers,
+)
+from app.responses import conditional_response, etag_matches, json_response_class
+from app.stats import player_stats_from_totals
+from app.stats_store import CAREER, LATEST_SEASON, StatsStore
+from app.team_stats import (
+    TeamTotals,
+    fetch_team_totals,
+    player_usage_rate,
+    team_cache,
+)
 from contextlib import asynccontextmanager
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    usage_writer.start()
+    get_directory()  # build the name index before serving traffic
+    schedulers = []
+    if config.INGEST_INTERVAL_SECONDS > 0:
+        schedulers.append(IngestScheduler(league_store, config.INGEST_INTERVAL_SECONDS))
+    if config.USAGE_RETENTION_INTERVAL_SECONDS > 0:
+        schedulers.append(RetentionScheduler(config.USAGE_RETENTION_INTERVAL_SECONDS))
+    for scheduler in schedulers:
+        scheduler.start()
     yield
+    for scheduler in schedulers:
+        scheduler.stop()
+    usage_writer.stop()  # write out rows still queued
+
 
+# Routes return it directly, so payloads skip FastAPI's jsonable_encoder
+APIResponse = json_response_class()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=APIResponse)
 
 
 class PlayerStats(BaseModel):
+    # None: not tracked upstream for early seasons (or, for usage_rate,
+    # team totals unavailable)
     points_per_game: float
-    true_shooting_pct: float
-    rebounds_per_game: float
-    assists_per_game: float
-    steals_per_game: float
-    blocks_per_game: float
-    turnovers_per_game: float
+    true_shooting_pct: Optional[float]
+    rebounds_per_game: Optional[float]
+    assists_per_game: Optional[float]
+    steals_per_game: Optional[float]
+    blocks_per_game: Optional[float]
+    turnovers_per_game: Optional[float]
     fg_pct: float
     fg3_pct: float
     ft_pct: float
-    minutes_per_game: float
-    usage_rate: Union[str, float]
+    minutes_per_game: Optional[float]
+    usage_rate: Optional[float]
     team: str
 
 
+# Seasons look like "2023-24"; omitted means the most recent season
+SEASON_PATTERN = r"^\d{4}-\d{2}$"
+
+
+class SeasonNotFound(LookupError):
+    pass
+
+
 @app.get("/player/{name}", response_model=PlayerStats)
-def get_player_stats(name: str):
+def get_player_stats(
+    name: str,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+):
     log_usage(endpoint="/player", payload=name)
     player_id = get_player_id(name)
     if not player_id:
         raise HTTPException(status_code=404, detail="Player not found")
 
     try:
-        return get_cached_player_stats(player_id)
+        cached = player_body(player_id, season)
+    except SeasonNotFound:
+        raise HTTPException(status_code=404, detail=f"No stats for season {season}")
     except ValueError:
         raise HTTPException(status_code=500, detail="Player data is incomplete")
 
+    return conditional_response(
+        cached.body, cached.etag, cached.validators, if_none_match
+    )
 
-@lru_cache(maxsize=128)
-def get_player_id(name: str):
-    player_list = players.get_players()
-    name = name.lower().replace("-", " ")
-    for player in player_list:
-        if player["full_name"].lower() == name:
-            return player["id"]
-    return None
 
+def player_body(player_id: int, season: Optional[str] = None) -> CachedBody:
+    """The /player body, encoded once per stats version and then reused.
 
-@lru_cache(maxsize=128)
-def get_cached_player_stats(player_id: int):
-    career = playercareerstats.PlayerCareerStats(player_id=player_id)
-    stats = career.get_data_frames()[0].iloc[-1]  # most recent season
+    A hit only looks up the version; the stats record itself is only
+    fetched when the body has to be built.
+    """
+    key = (player_id, season or LATEST_SEASON)
+    version = stats_version(player_id, season)
+    cached = response_cache.get(key, version)
+    if cached is None:
+        stats = get_cached_player_stats(player_id, season)
+        # Records are built from validated numbers; skip re-validating them
+        body = APIResponse(stats.to_dict()).body
+        cached = response_cache.set(key, version, stats, body)
+    return cached
 
-    gp = stats["GP"]
-    pts = stats["PTS"]
-    fga = stats["FGA"]
-    fta = stats["FTA"]
 
-    # Defensive fallback if stats are missing
-    if gp == 0 or fga == 0:
-        raise ValueError("Insufficient data for this player")
+@app.get("/player/{name}/career")
+def get_player_career(name: str):
+    log_usage(endpoint="/player/career", payload=name)
+    player_id = get_player_id(name)
+    if not player_id:
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    career = get_cached_career(player_id)
+    return APIResponse(
+        {
+            "player_id": player_id,
+            # Traded players have a row per team plus a TOT row
+            "seasons": len(set(career.get("SEASON_ID", []))),
+            "columns": career,
+        }
+    )
+
+
+@app.get("/players/search")
+def search_players(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+):
+    return {"prefix": prefix, "results": get_directory().complete(prefix, limit)}
 
-    # Calculate advanced stats
-    ppg = round(pts / gp, 1)
-    ts_pct = round(pts / (2 * (fga + 0.44 * fta)), 3)
 
+@app.get("/admin/cache")
+def get_cache_stats():
     return {
-        "points_per_game": ppg,
-        "true_shooting_pct": ts_pct,
-        "rebounds_per_game": round(stats["REB"] / gp, 1),
-        "assists_per_game": round(stats["AST"] / gp, 1),
-        "steals_per_game": round(stats["STL"] / gp, 1),
-        "blocks_per_game": round(stats["BLK"] / gp, 1),
-        "turnovers_per_game": round(stats["TOV"] / gp, 1),
-        "fg_pct": round(stats["FG_PCT"], 3),
-        "fg3_pct": round(stats["FG3_PCT"], 3),
-        "ft_pct": round(stats["FT_PCT"], 3),
-        "minutes_per_game": round(stats["MIN"] / gp, 1),
-        "usage_rate": "N/A",
-        "team": stats["TEAM_ABBREVIATION"],
+        "stats": stats_cache.stats(),
+        "careers": career_cache.stats(),
+        "responses": response_cache.stats(),
     }
 
 
+@app.get("/admin/usage")
+def get_usage(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    bucket: str = Query("hour", pattern="^(hour|day)$"),
+    top: int = Query(10, ge=1, le=100),
+):
+    return usage_summary(hours, bucket, top)
+
+
+@app.get("/league/leaders")
+def get_league_leaders(
+    stat: str = Query("PTS"),
+    limit: int = Query(10, ge=1, le=100),
+    min_games: int = Query(1, ge=0),
+):
+    stat = stat.upper()
+    if stat not in STAT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown stat '{stat}'")
+
+    snapshot = league_store.snapshot
+    directory = get_directory()
+    leaders = snapshot.leaders(stat, limit, min_games)
+    for leader in leaders:
+        leader["name"] = directory.name(leader["player_id"])
+    return APIResponse({"season": snapshot.season, "stat": stat, "leaders": leaders})
+
+
+def get_player_id(name: str):
+    return get_directory().resolve(name)
+
+
+# Upstream career tables, persisted so a restart doesn't go upstream again
+career_cache = TTLCache(
+    maxsize=config.CAREER_CACHE_SIZE,
+    ttl=config.STATS_TTL_SECONDS,
+    max_stale=config.STATS_MAX_STALE_SECONDS,
+    store=StatsStore(config.STATS_DB_FILE) if config.STATS_DB_FILE else None,
+)
+
+# PlayerStatsRecords per (player_id, season), rebuilt whenever the career
+# they came from is refreshed, so they share career_cache's freshness. They
+# keep only the career's version, never the career itself.
+stats_cache = DerivedCache(maxsize=config.STATS_CACHE_SIZE)
+
+
+# Encoded /player bodies, valid while their stats version is current
+response_cache = ResponseCache(maxsize=config.RESPONSE_CACHE_SIZE)
+
+
+# Current-season totals for the whole league, filled by app.ingest
+league_store = LeagueStore()
+
+
+def get_cached_player_stats(
+    player_id: int, season: Optional[str] = None
+) -> PlayerStatsRecord:
+    snapshot = league_store.snapshot
+    if season in (None, snapshot.season) and player_id in snapshot.rows:
+        teams, _ = league_teams(snapshot)
+        return derived_metrics(snapshot, teams).player(player_id)
+
+    key = (player_id, season or LATEST_SEASON)
+    version = career_version(player_id)
+    stats = stats_cache.get(key, version, load_player_stats, player_id, key[1])
+    if stats is None:
+        raise SeasonNotFound(season)
+    return stats
+
+
+def stats_version(player_id: int, season: Optional[str] = None) -> Hashable:
+    """Changes whenever the player's stats record for ``season`` would."""
+    snapshot = league_store.snapshot
+    if season in (None, snapshot.season) and player_id in snapshot.rows:
+        return snapshot.version, league_teams(snapshot)[1]
+    return career_version(player_id)
+
+
+def league_teams(snapshot) -> Tuple[Optional[TeamTotals], Optional[int]]:
+    """The snapshot season's team totals and their version, if available."""
+    try:
+        return team_cache.get_versioned(
+            snapshot.season, fetch_team_totals, snapshot.season
+        )
+    except Exception:
+        # As in player_usage_rate: serve the stats with usage_rate None
+        logger.exception("Team totals unavailable for %s", snapshot.season)
+        return None, None
+
+
+def career_version(player_id: int) -> int:
+    return career_cache.get_versioned((player_id, CAREER), fetch_career, player_id)[1]
+
+
+def load_player_stats(player_id: int, season: str) -> Optional[PlayerStatsRecord]:
+    totals = fetch_season_totals(player_id, season)
+    if totals is None:
+        return None
+    usage = player_usage_rate(totals, totals["SEASON_ID"])
+    return player_stats_from_totals(totals, usage)
+
+
+def stats_cached(player_id: int, season: Optional[str] = None) -> bool:
+    """True if the player's stats can be served without going upstream."""
+    snapshot = league_store.snapshot
+    if season in (None, snapshot.season) and player_id in snapshot.rows:
+        return snapshot.season in team_cache
+    return (player_id, CAREER) in career_cache
+
+
+# Bounded pool so multi-player routes fetch cold players in parallel
+_fetch_pool = ThreadPoolExecutor(
+    max_workers=config.FETCH_WORKERS, thread_name_prefix="stats-fetch"
+)
+
+
+def fan_out(
+    fn: Callable, player_ids: Iterable[int], season: Optional[str] = None
+) -> List[Future]:
+    """``fn(player_id, season)`` for each player, as futures in order.
+
+    Only players that need an upstream fetch go to the shared pool; cached
+    ones are served in the request thread, so they never queue behind other
+    requests' fetches.
+    """
+    player_ids = list(player_ids)
+    futures = [None] * len(player_ids)
+    hits = []
+    for i, player_id in enumerate(player_ids):
+        if stats_cached(player_id, season):
+            hits.append(i)
+        else:
+            futures[i] = _fetch_pool.submit(fn, player_id, season)
+    for i in hits:
+        futures[i] = _completed(fn, player_ids[i], season)
+    return futures
+
+
+def _completed(fn: Callable, *args) -> Future:
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def submit_player_stats(
+    player_ids: Iterable[int], season: Optional[str] = None
+) -> List[Future]:
+    return fan_out(get_cached_player_stats, player_ids, season)
+
+
+def get_cached_career(player_id: int) -> Career:
+    return career_cache.get((player_id, CAREER), fetch_career, player_id)
+
+
+def fetch_season_totals(player_id: int, season: str) -> Optional[dict]:
+    # Every season comes from the one cached career fetch
+    return season_totals(get_cached_career(player_id), season)
+
+
+def fetch_career(player_id: int) -> Career:
+    # The only per-player upstream call: every season is derived from it
+    return get_provider().career_totals(player_id)
+
+
 @app.get("/compare")
-def compare_players(player1: str = Query(...), player2: str = Query(...)):
+def compare_players(
+    player1: str = Query(...),
+    player2: str = Query(...),
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+):
     log_usage(endpoint="/compare", payload=f"{player1} vs {player2}")
     p1_id = get_player_id(player1)
     p2_id = get_player_id(player2)
@@ -100,22 +339,43 @@ def compare_players(player1: str = Query(...), player2: str = Query(...)):
     if not p1_id or not p2_id:
         raise HTTPException(status_code=404, detail="One or both players not found")
 
+    p1_future, p2_future = fan_out(player_body, (p1_id, p2_id), season)
     try:
-        p1_stats = get_cached_player_stats(p1_id)
-        p2_stats = get_cached_player_stats(p2_id)
+        p1_cached = p1_future.result()
+        p2_cached = p2_future.result()
+    except SeasonNotFound:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No stats for season {season} for one or both players",
+        )
     except ValueError:
         raise HTTPException(
             status_code=500, detail="Failed to retrieve stats for one or both players"
         )
 
-    # Use capitalized names in output for readability
-    def format_name(slug):
-        return " ".join(word.capitalize() for word in slug.split("-"))
-
-    return {
-        "player1": {**p1_stats, "name": format_name(player1)},
-        "player2": {**p2_stats, "name": format_name(player2)},
-    }
+    # The matched players' names, not the slugs (which may be typos)
+    directory = get_directory()
+    name1, name2 = directory.name(p1_id), directory.name(p2_id)
+
+    # Both players' versions plus their names identify the body, so a
+    # revalidation is answered without encoding anything
+    etag = etag_for(
+        p1_cached.etag.encode(),
+        p2_cached.etag.encode(),
+        f"{name1}\n{name2}".encode(),
+    )
+    last_modified = max(p1_cached.last_modified, p2_cached.last_modified)
+    validators = validator_headers(etag, last_modified)
+    if etag_matches(if_none_match, etag):
+        return conditional_response(b"", etag, validators, if_none_match)
+
+    body = APIResponse(
+        {
+            "player1": dict(p1_cached.source.to_dict(), name=name1),
+            "player2": dict(p2_cached.source.to_dict(), name=name2),
+        }
+    ).body
+    return conditional_response(body, etag, validators)
 
 
 class LineupRequest(BaseModel):
@@ -127,31 +387,39 @@ def get_lineup_stats(
     request: LineupRequest,
     metric: str = Query("avg", pattern="^(avg|total)$"),
     stats: Optional[str] = Query(None),
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
 ):
-    player_stats = []
-    names = []
-
+    player_ids = []
     for player_slug in request.players:
         player_id = get_player_id(player_slug)
         if not player_id:
             raise HTTPException(
                 status_code=404, detail=f"Player '{player_slug}' not found"
             )
+        player_ids.append(player_id)
+
+    player_stats = []
+    names = []
+    futures = submit_player_stats(player_ids, season)
 
+    for player_slug, player_id, future in zip(request.players, player_ids, futures):
         try:
-            stats_data = get_cached_player_stats(player_id)
+            stats_data = future.result()
+        except SeasonNotFound:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No stats for season {season} for '{player_slug}'",
+            )
         except ValueError:
             raise HTTPException(
                 status_code=500, detail=f"Stats unavailable for '{player_slug}'"
             )
 
         player_stats.append(stats_data)
-        names.append(" ".join(word.capitalize() for word in player_slug.split("-")))
+        names.append(get_directory().name(player_id))
 
-    # Filter down to valid fields
-    stat_fields = list(player_stats[0].keys())
-    stat_fields.remove("team")  # Don't aggregate team names
-    stat_fields.remove("usage_rate")  # Placeholder field, not numeric
+    # Filter down to valid fields (every numeric field; not team names)
+    stat_fields = list(STAT_FIELDS)
 
     if stats:
         requested = set(stats.split(","))
@@ -159,14 +427,19 @@ def get_lineup_stats(
 
     # Perform aggregation
     def aggregate(field):
-        values = [p[field] for p in player_stats]
+        # usage_rate is None when team totals were unavailable
+        values = [p[field] for p in player_stats if p[field] is not None]
+        if not values:
+            return None
         if metric == "avg":
             return round(sum(values) / len(values), 2)
         else:
             return round(sum(values), 2)
 
-    return {
-        "lineup": names,
-        "metric": metric,
-        **{f"{metric}_{field}": aggregate(field) for field in stat_fields},
-    }
+    return APIResponse(
+        {
+            "lineup": names,
+            "metric": metric,
+            **{f"{metric}_{field}": aggregate(field) for field in stat_fields},
+        }
+    )
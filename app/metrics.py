@@ -0,0 +1,100 @@
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.league_store import LeagueSnapshot
+from app.records import STAT_FIELDS, PlayerStatsRecord
+from app.team_stats import TeamTotals, usage_rate
+
+# Output field -> totals column, divided by games played
+PER_GAME = {
+    "points_per_game": "PTS",
+    "rebounds_per_game": "REB",
+    "assists_per_game": "AST",
+    "steals_per_game": "STL",
+    "blocks_per_game": "BLK",
+    "turnovers_per_game": "TOV",
+    "minutes_per_game": "MIN",
+}
+
+# Output field -> percentage column, taken as-is
+PERCENTAGES = {"fg_pct": "FG_PCT", "fg3_pct": "FG3_PCT", "ft_pct": "FT_PCT"}
+
+
+class DerivedMetrics:
+    """Per-game and shooting metrics for every player of a snapshot."""
+
+    def __init__(self, snapshot: LeagueSnapshot, teams: Optional[TeamTotals] = None):
+        cols = snapshot.columns
+        gp = cols["GP"]
+        fga = cols["FGA"]
+
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        # Same guard as the scalar path: no games or no shots, no stats
+        self.valid = (gp > 0) & (fga > 0)
+
+        games = np.where(gp > 0, gp, 1.0)
+        attempts = 2 * (fga + 0.44 * cols["FTA"])
+        true_shooting = np.divide(
+            cols["PTS"],
+            attempts,
+            out=np.zeros_like(attempts),
+            where=attempts > 0,
+        )
+
+        self.columns: Dict[str, np.ndarray] = {
+            "true_shooting_pct": np.round(true_shooting, 3)
+        }
+        for field, column in PER_GAME.items():
+            self.columns[field] = np.round(cols[column] / games, 1)
+        for field, column in PERCENTAGES.items():
+            self.columns[field] = np.round(np.nan_to_num(cols[column]), 3)
+
+        # NaN where it can't be derived (no minutes or no team totals)
+        usage = np.full(len(snapshot), np.nan)
+        if teams is not None:
+            team_minutes, team_possessions = teams.align(snapshot.team_ids)
+            minutes = cols["MIN"]
+            played = minutes > 0
+            usage[played] = usage_rate(
+                fga[played],
+                cols["FTA"][played],
+                cols["TOV"][played],
+                minutes[played],
+                team_minutes[played],
+                team_possessions[played],
+            )
+        self.columns["usage_rate"] = np.round(usage, 1)
+
+        # Row-major copy, so a player's record is one contiguous slice
+        self.table = np.column_stack([self.columns[f] for f in STAT_FIELDS])
+        # Built on first request and reused, so a record's identity is
+        # stable until the next snapshot (see app.response_cache)
+        self._records: Dict[int, PlayerStatsRecord] = {}
+
+    def player(self, player_id: int) -> Optional[PlayerStatsRecord]:
+        """Stats for one player, None if not in the snapshot.
+
+        Raises ValueError for players with no games or attempts.
+        """
+        i = self.snapshot.rows.get(player_id)
+        if i is None:
+            return None
+        if not self.valid[i]:
+            raise ValueError("Insufficient data for this player")
+
+        record = self._records.get(i)
+        if record is None:
+            record = PlayerStatsRecord(self.table[i].tobytes(), self.snapshot.teams[i])
+            self._records[i] = record
+        return record
+
+
+@lru_cache(maxsize=1)
+def derived_metrics(
+    snapshot: LeagueSnapshot, teams: Optional[TeamTotals] = None
+) -> DerivedMetrics:
+    """Computed once per snapshot, i.e. until the next league refresh."""
+    return DerivedMetrics(snapshot, teams)
@@ -0,0 +1,121 @@
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+def _create_usage_log(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS usage_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            endpoint TEXT NOT NULL,
+            payload TEXT,
+            timestamp TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _normalize_usage_log(conn: sqlite3.Connection):
+    # Tables first created by the old log_usage had (timestamp, endpoint,
+    # payload) with nothing NOT NULL; rebuild those in init_db's shape
+    columns = conn.execute("PRAGMA table_info(usage_log)").fetchall()
+    if [(name, notnull) for _, name, _, notnull, _, _ in columns] == [
+        ("id", 0),
+        ("endpoint", 1),
+        ("payload", 0),
+        ("timestamp", 1),
+    ]:
+        return
+    conn.execute("ALTER TABLE usage_log RENAME TO usage_log_old")
+    _create_usage_log(conn)
+    conn.execute(
+        """
+        INSERT INTO usage_log (id, endpoint, payload, timestamp)
+        SELECT id, coalesce(endpoint, ''), payload, coalesce(timestamp, '')
+        FROM usage_log_old
+        """
+    )
+    conn.execute("DROP TABLE usage_log_old")
+
+
+def _index_usage_log(conn: sqlite3.Connection):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS usage_log_timestamp ON usage_log (timestamp)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS usage_log_endpoint"
+        " ON usage_log (endpoint, timestamp)"
+    )
+
+
+def _create_usage_rollup(conn: sqlite3.Connection):
+    # Request counts per hour (later per day, see app.retention), endpoint
+    # and payload; kept in step with usage_log by the batch writer
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS usage_rollup (
+            bucket TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            payload TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL,
+            PRIMARY KEY (bucket, endpoint, payload)
+        ) WITHOUT ROWID
+        """
+    )
+    if conn.execute("SELECT 1 FROM usage_rollup LIMIT 1").fetchone():
+        return
+    # Rows logged before the rollup existed
+    conn.execute(
+        """
+        INSERT INTO usage_rollup (bucket, endpoint, payload, count)
+        SELECT substr(timestamp, 1, 13), endpoint, coalesce(payload, ''), COUNT(*)
+        FROM usage_log
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+# Schema version N is reached by applying MIGRATIONS[N - 1]. Append only:
+# released steps must never change.
+MIGRATIONS = (
+    _create_usage_log,
+    _normalize_usage_log,
+    _index_usage_log,
+    _create_usage_rollup,
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Bring the usage database up to SCHEMA_VERSION; returns steps applied.
+
+    All pending steps run in one IMMEDIATE transaction, so workers starting
+    together apply them exactly once and never see a half-migrated schema.
+    """
+    if schema_version(conn) == SCHEMA_VERSION:
+        return 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the lock: another worker may have just migrated
+        current = schema_version(conn)
+        if current > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Usage database is at schema {current}, newer than this code "
+                f"({SCHEMA_VERSION})"
+            )
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[version - 1](conn)
+            logger.info("Usage database migrated to schema %d", version)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return SCHEMA_VERSION - current
@@ -0,0 +1,29 @@
+import re
+import unicodedata
+
+# Generational suffixes that clients routinely omit ("Gary Payton II")
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+
+_SEPARATORS = re.compile(r"[\s\-_/.,]+")
+_PUNCTUATION = re.compile(r"[^\w ]")
+
+
+def normalize_name(text: str) -> str:
+    """Fold accents, case and punctuation: "Jokić-Jr." -> "jokic jr"."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _SEPARATORS.sub(" ", text.casefold())
+    return _PUNCTUATION.sub("", text).strip()
+
+
+def strip_suffix(name: str) -> str:
+    words = name.split()
+    while len(words) > 2 and words[-1] in SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def compact(name: str) -> str:
+    """Spaceless key, so "d angelo" and "dangelo" compare equal."""
+    return name.replace(" ", "")
@@ -0,0 +1,47 @@
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicThread:
+    """Daemon thread calling ``fn(*args)`` every ``interval`` seconds.
+
+    With ``run_first`` the first call happens on ``start()`` rather than
+    one interval later. Exceptions are logged and the schedule goes on.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        fn: Callable,
+        *args,
+        run_first: bool = False,
+    ):
+        self.interval = interval
+        self.fn = fn
+        self.args = args
+        self.run_first = run_first
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        if self.run_first:
+            self._call()
+        while not self._stop.wait(self.interval):
+            self._call()
+
+    def _call(self):
+        try:
+            self.fn(*self.args)
+        except Exception:
+            logger.exception("%s failed", self._thread.name)
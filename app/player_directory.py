@@ -0,0 +1,148 @@
+import heapq
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from nba_api.stats.static import players
+
+from app.normalize import compact, normalize_name, strip_suffix
+
+# Minimum trigram (Jaccard) similarity for a fuzzy match to count
+FUZZY_THRESHOLD = 0.5
+
+
+def trigrams(text: str) -> set:
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(map("".join, zip(padded, padded[1:], padded[2:])))
+    return grams
+
+
+class PlayerDirectory:
+    """Name -> player id index built once from the static player list."""
+
+    def __init__(self, player_list: Iterable[dict]):
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._players: List[dict] = []
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        prefixes = {True: [], False: []}
+        names = []
+
+        for player in player_list:
+            name = normalize_name(player["full_name"])
+            names.append(name)
+            self._names.setdefault(player["id"], player["full_name"])
+            # First entry wins, matching the old linear scan
+            self._ids.setdefault(compact(name), player["id"])
+
+            row = len(self._players)
+            grams = trigrams(name)
+            self._players.append(player)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(row)
+
+            # Complete on the full name and on every later word ("curry")
+            words = name.split()
+            bucket = prefixes[bool(player.get("is_active"))]
+            for i in range(len(words)):
+                bucket.append((" ".join(words[i:]), row))
+
+        # "Gary Payton" must still find the player without the suffix, but
+        # never shadow a player whose full name it is
+        for name, player in zip(names, self._players):
+            self._ids.setdefault(compact(strip_suffix(name)), player["id"])
+
+        # Sorted (key, row) arrays, searched with bisect; actives rank first
+        self._prefixes = [sorted(prefixes[True]), sorted(prefixes[False])]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def lookup(self, name: str) -> Optional[int]:
+        return self._lookup(normalize_name(name))
+
+    def _lookup(self, name: str) -> Optional[int]:
+        player_id = self._ids.get(compact(name))
+        if player_id is None:
+            player_id = self._ids.get(compact(strip_suffix(name)))
+        return player_id
+
+    def name(self, player_id: int) -> Optional[str]:
+        return self._names.get(player_id)
+
+    def search(
+        self, name: str, limit: int = 5, threshold: float = FUZZY_THRESHOLD
+    ) -> List[dict]:
+        return self._search(normalize_name(name), limit, threshold)
+
+    def _search(self, name: str, limit: int, threshold: float) -> List[dict]:
+        query = trigrams(name)
+        if not query:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query:
+            for row in self._postings.get(gram, ()):
+                shared[row] = shared.get(row, 0) + 1
+
+        size = len(query)
+        scored = []
+        for row, count in shared.items():
+            score = count / (size + self._gram_counts[row] - count)
+            if score >= threshold:
+                # Active players win ties against retired namesakes
+                active = bool(self._players[row].get("is_active"))
+                scored.append((score, active, -row))
+
+        return [
+            {
+                "id": self._players[-row]["id"],
+                "full_name": self._players[-row]["full_name"],
+                "score": round(score, 3),
+            }
+            for score, _, row in heapq.nlargest(limit, scored)
+        ]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[dict]:
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        rows: List[int] = []
+        for entries in self._prefixes:
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(rows) < limit:
+                key, row = entries[i]
+                if not key.startswith(prefix):
+                    break
+                if row not in rows:
+                    rows.append(row)
+                i += 1
+
+        return [
+            {
+                "id": self._players[row]["id"],
+                "full_name": self._players[row]["full_name"],
+                "is_active": bool(self._players[row].get("is_active")),
+            }
+            for row in rows
+        ]
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Exact lookup, falling back to the best fuzzy match."""
+        name = normalize_name(name)
+        player_id = self._lookup(name)
+        if player_id is None:
+            candidates = self._search(name, 1, FUZZY_THRESHOLD)
+            if candidates:
+                player_id = candidates[0]["id"]
+        return player_id
+
+
+@lru_cache(maxsize=None)
+def get_directory() -> PlayerDirectory:
+    return PlayerDirectory(players.get_players())
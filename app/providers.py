@@ -0,0 +1,227 @@
+import json
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from nba_api.stats.endpoints import (
+    leaguedashplayerstats,
+    leaguedashteamstats,
+    playercareerstats,
+)
+from nba_api.stats.library.parameters import Season
+
+from app import config
+from app.resultsets import Table, parse_result_set, table_from_rows
+
+CAREER_TABLE = "SeasonTotalsRegularSeason"
+
+CAREER_HEADERS = [
+    "PLAYER_ID",
+    "SEASON_ID",
+    "LEAGUE_ID",
+    "TEAM_ID",
+    "TEAM_ABBREVIATION",
+    "PLAYER_AGE",
+    "GP",
+    "GS",
+    "MIN",
+    "FGM",
+    "FGA",
+    "FG_PCT",
+    "FG3M",
+    "FG3A",
+    "FG3_PCT",
+    "FTM",
+    "FTA",
+    "FT_PCT",
+    "OREB",
+    "DREB",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "PF",
+    "PTS",
+]
+
+# Team columns usage rate needs, for empty team tables
+TEAM_HEADERS = ["TEAM_ID", "TEAM_NAME", "GP", "MIN", "FGA", "FTA", "TOV"]
+
+
+class StatsProvider(ABC):
+    """Source of upstream stats tables.
+
+    All methods return column-oriented Tables (see app.resultsets) with
+    the stats.nba.com column names. ``career_totals`` has the player's
+    regular-season totals, one row per season (oldest first).
+    ``league_totals`` has one totals row per player for a whole season in
+    a single request, and ``team_totals`` one row per team.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def career_totals(self, player_id: int) -> Table: ...
+
+    @abstractmethod
+    def league_totals(self, season: str) -> Table: ...
+
+    @abstractmethod
+    def team_totals(self, season: str) -> Table: ...
+
+
+class NbaApiProvider(StatsProvider):
+    """Live stats.nba.com data through nba_api.
+
+    Reads the raw JSON (``get_dict``) rather than ``get_data_frames`` so no
+    DataFrames are built per fetch.
+    """
+
+    name = "nba_api"
+
+    def career_totals(self, player_id: int) -> Table:
+        career = playercareerstats.PlayerCareerStats(player_id=player_id)
+        return parse_result_set(career.get_dict(), CAREER_TABLE)
+
+    def league_totals(self, season: str) -> Table:
+        dashboard = leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season, per_mode_detailed="Totals"
+        )
+        return parse_result_set(dashboard.get_dict(), "LeagueDashPlayerStats")
+
+    def team_totals(self, season: str) -> Table:
+        dashboard = leaguedashteamstats.LeagueDashTeamStats(
+            season=season, per_mode_detailed="Totals"
+        )
+        return parse_result_set(dashboard.get_dict(), "LeagueDashTeamStats")
+
+
+class FixtureProvider(StatsProvider):
+    """Offline provider for tests and benchmarks.
+
+    Serves ``<fixtures_dir>/career/<player_id>.json`` payloads in the
+    upstream ``resultSets`` format, and synthesizes a deterministic career
+    for any player without a fixture. League totals for a season are
+    assembled from the career fixtures that cover it, and team totals are
+    read from ``<fixtures_dir>/teams/<season>.json``. ``delay`` (seconds)
+    is added to every call to model upstream latency in benchmarks.
+    """
+
+    name = "fixtures"
+
+    def __init__(self, fixtures_dir: str, delay: float = 0.0):
+        self.fixtures_dir = fixtures_dir
+        self.delay = delay
+
+    def career_totals(self, player_id: int) -> Table:
+        if self.delay:
+            time.sleep(self.delay)
+        return parse_result_set(self.load_payload(player_id), CAREER_TABLE)
+
+    def league_totals(self, season: str) -> Table:
+        if self.delay:
+            time.sleep(self.delay)
+        rows = {}
+        career_dir = os.path.join(self.fixtures_dir, "career")
+        for filename in sorted(os.listdir(career_dir)):
+            player_id = int(os.path.splitext(filename)[0])
+            payload = self.load_payload(player_id)
+            table = payload["resultSets"][0]
+            season_at = table["headers"].index("SEASON_ID")
+            for row in table["rowSet"]:
+                # Later rows (e.g. the TOT row of a traded player) win
+                if row[season_at] == season:
+                    rows[player_id] = row
+        return table_from_rows(CAREER_HEADERS, rows.values())
+
+    def team_totals(self, season: str) -> Table:
+        if self.delay:
+            time.sleep(self.delay)
+        path = os.path.join(self.fixtures_dir, "teams", f"{season}.json")
+        if not os.path.exists(path):
+            return table_from_rows(TEAM_HEADERS, [])
+        with open(path) as f:
+            return parse_result_set(json.load(f), "LeagueDashTeamStats")
+
+    def load_payload(self, player_id: int) -> dict:
+        path = os.path.join(self.fixtures_dir, "career", f"{player_id}.json")
+        if not os.path.exists(path):
+            return synthetic_career_payload(player_id)
+        with open(path) as f:
+            return json.load(f)
+
+
+def synthetic_career_payload(player_id: int, seasons: int = 5) -> dict:
+    # Not security sensitive: seeded so each player always gets the same career
+    rng = random.Random(player_id)  # nosec B311
+    teams = ["ATL", "BOS", "DEN", "GSW", "LAL", "MIA", "MIL", "NYK", "PHX"]
+    start_year = 2024 - seasons + 1
+    rows = []
+    for i in range(seasons):
+        gp = rng.randint(40, 82)
+        minutes = gp * rng.uniform(15, 36)
+        fga = round(minutes * rng.uniform(0.3, 0.55))
+        fgm = round(fga * rng.uniform(0.4, 0.55))
+        fg3a = round(fga * rng.uniform(0.1, 0.45))
+        fg3m = round(fg3a * rng.uniform(0.3, 0.42))
+        fta = round(fga * rng.uniform(0.15, 0.4))
+        ftm = round(fta * rng.uniform(0.65, 0.9))
+        oreb = round(minutes * rng.uniform(0.01, 0.08))
+        dreb = round(minutes * rng.uniform(0.08, 0.25))
+        year = start_year + i
+        rows.append(
+            [
+                player_id,
+                f"{year}-{(year + 1) % 100:02d}",
+                "00",
+                1610612700 + rng.randint(37, 66),
+                rng.choice(teams),
+                21.0 + i,
+                gp,
+                rng.randint(0, gp),
+                round(minutes, 1),
+                fgm,
+                fga,
+                round(fgm / fga, 3) if fga else 0.0,
+                fg3m,
+                fg3a,
+                round(fg3m / fg3a, 3) if fg3a else 0.0,
+                ftm,
+                fta,
+                round(ftm / fta, 3) if fta else 0.0,
+                oreb,
+                dreb,
+                oreb + dreb,
+                round(minutes * rng.uniform(0.03, 0.2)),
+                round(minutes * rng.uniform(0.01, 0.05)),
+                round(minutes * rng.uniform(0.005, 0.05)),
+                round(minutes * rng.uniform(0.03, 0.1)),
+                round(minutes * rng.uniform(0.05, 0.12)),
+                2 * (fgm - fg3m) + 3 * fg3m + ftm,
+            ]
+        )
+    return {
+        "resource": "playercareerstats",
+        "parameters": {"PlayerID": player_id, "PerMode": "Totals"},
+        "resultSets": [
+            {"name": CAREER_TABLE, "headers": CAREER_HEADERS, "rowSet": rows}
+        ],
+    }
+
+
+def current_season() -> str:
+    return config.CURRENT_SEASON or Season.default
+
+
+@lru_cache(maxsize=None)
+def get_provider() -> StatsProvider:
+    if config.STATS_PROVIDER == NbaApiProvider.name:
+        return NbaApiProvider()
+    if config.STATS_PROVIDER == FixtureProvider.name:
+        return FixtureProvider(
+            config.STATS_FIXTURES_DIR, config.STATS_FIXTURE_DELAY_MS / 1000
+        )
+    raise ValueError(f"Unknown STATS_PROVIDER {config.STATS_PROVIDER!r}")
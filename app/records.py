@@ -0,0 +1,83 @@
+import math
+import sys
+from array import array
+from typing import Iterable
+
+# Numeric PlayerStats fields, in response order; "team" follows them
+STAT_FIELDS = (
+    "points_per_game",
+    "true_shooting_pct",
+    "rebounds_per_game",
+    "assists_per_game",
+    "steals_per_game",
+    "blocks_per_game",
+    "turnovers_per_game",
+    "fg_pct",
+    "fg3_pct",
+    "ft_pct",
+    "minutes_per_game",
+    "usage_rate",
+)
+_INDEX = {field: i for i, field in enumerate(STAT_FIELDS)}
+
+
+class PlayerStatsRecord:
+    """Immutable player stats with the numeric fields packed in one array.
+
+    This is what the stats cache holds and what routes serialize. Unknown
+    values (usage_rate without team totals, counts upstream didn't track
+    in early seasons) are stored as NaN and read back as None.
+    """
+
+    __slots__ = ("_values", "team")
+
+    def __init__(self, values: Iterable[float], team: str):
+        values = array("d", values)
+        if len(values) != len(STAT_FIELDS):
+            raise ValueError(f"Expected {len(STAT_FIELDS)} values, got {len(values)}")
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "team", sys.intern(str(team)))
+
+    @classmethod
+    def from_dict(cls, stats: dict) -> "PlayerStatsRecord":
+        values = [stats[field] for field in STAT_FIELDS]
+        values = [math.nan if value is None else value for value in values]
+        return cls(values, stats["team"])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PlayerStatsRecord is immutable")
+
+    def __getitem__(self, field: str):
+        if field == "team":
+            return self.team
+        value = self._values[_INDEX[field]]
+        return None if math.isnan(value) else value
+
+    def __contains__(self, field) -> bool:
+        return field == "team" or field in _INDEX
+
+    def keys(self):
+        return STAT_FIELDS + ("team",)
+
+    def to_dict(self) -> dict:
+        stats = {
+            field: None if math.isnan(value) else value
+            for field, value in zip(STAT_FIELDS, self._values)
+        }
+        stats["team"] = self.team
+        return stats
+
+    def __eq__(self, other):
+        if not isinstance(other, PlayerStatsRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PlayerStatsRecord({self.to_dict()!r})"
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by this record (the team string is shared)."""
+        return sys.getsizeof(self) + sys.getsizeof(self._values)
@@ -0,0 +1,96 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Hashable, Optional
+
+
+def etag_for(*parts: bytes) -> str:
+    """Strong validator over the given bytes."""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def validator_headers(etag: str, last_modified: float) -> list:
+    """Raw (name, value) ETag/Last-Modified/Cache-Control header pairs."""
+    return [
+        (b"etag", etag.encode("latin-1")),
+        (b"last-modified", formatdate(last_modified, usegmt=True).encode("latin-1")),
+        # Caches may store it but must revalidate before reusing it
+        (b"cache-control", b"no-cache"),
+    ]
+
+
+class CachedBody:
+    """An encoded body plus the validators that go with it.
+
+    ``last_modified`` is when this version of the source was first served.
+    The validator headers are built and encoded once here, not per hit.
+    """
+
+    __slots__ = ("version", "source", "body", "etag", "last_modified", "validators")
+
+    def __init__(self, version, source, body: bytes, last_modified: float):
+        self.version = version
+        self.source = source
+        self.body = body
+        self.etag = etag_for(body)
+        self.last_modified = last_modified
+        self.validators = validator_headers(self.etag, last_modified)
+
+
+class ResponseCache:
+    """LRU of encoded response bodies, each tied to a version of its source.
+
+    A body is only returned while the caller's version of the source equals
+    the one it was encoded from. Callers pass a cheap version token, so a
+    hit needs neither the source value nor any encoding.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key: Hashable, version) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, version, source, body: bytes) -> CachedBody:
+        entry = CachedBody(version, source, body, time.time())
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
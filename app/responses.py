@@ -0,0 +1,61 @@
+import logging
+from typing import Optional, Type
+
+from fastapi.responses import JSONResponse, Response
+
+from app import config
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (NumPy scalars and arrays included)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_response_class(name: Optional[str] = None) -> Type[JSONResponse]:
+    """Response class for ``name`` (default config.JSON_ENCODER).
+
+    Falls back to the stdlib encoder when orjson isn't installed.
+    """
+    name = (name or config.JSON_ENCODER).lower()
+    if name == "orjson":
+        if orjson is not None:
+            return ORJSONResponse
+        logger.warning("orjson is not installed; using the stdlib JSON encoder")
+    elif name != "json":
+        raise ValueError(f"Unknown JSON encoder '{name}'")
+    return JSONResponse
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header covers ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def conditional_response(
+    body: bytes, etag: str, validators: list, if_none_match: Optional[str] = None
+) -> Response:
+    """``body`` with its validator headers, or an empty 304 if the client has it.
+
+    ``validators`` are raw header pairs from app.response_cache, appended
+    as-is so cache hits don't re-encode them.
+    """
+    if etag_matches(if_none_match, etag):
+        response = Response(status_code=304)
+    else:
+        response = Response(body, media_type="application/json")
+    response.raw_headers.extend(validators)
+    return response
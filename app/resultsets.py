@@ -0,0 +1,27 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# A stats.nba.com result set, column-oriented: header -> one value per row.
+# Built straight from the raw ``resultSets`` JSON, without pandas.
+Table = Dict[str, List]
+
+
+def table_from_rows(headers: Sequence[str], rows: Iterable[Sequence]) -> Table:
+    columns = list(zip(*rows))
+    if not columns:
+        return {header: [] for header in headers}
+    return {header: list(column) for header, column in zip(headers, columns)}
+
+
+def parse_result_set(payload: dict, name: Optional[str] = None) -> Table:
+    """The result set called ``name`` (default: the first) as a Table."""
+    result_sets = payload.get("resultSets", payload.get("resultSet"))
+    if isinstance(result_sets, dict):
+        result_sets = [result_sets]
+    for result_set in result_sets or []:
+        if name is None or result_set["name"] == name:
+            return table_from_rows(result_set["headers"], result_set["rowSet"])
+    raise ValueError(f"No {name} result set in payload")
+
+
+def table_len(table: Table) -> int:
+    return len(next(iter(table.values()), []))
@@ -0,0 +1,120 @@
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app import config
+from app.db import get_connection
+from app.periodic import PeriodicThread
+
+logger = logging.getLogger(__name__)
+
+# Oldest raw rows first, through the timestamp index
+DELETE_RAW_BATCH = """
+    DELETE FROM usage_log WHERE id IN (
+        SELECT id FROM usage_log WHERE timestamp < ? ORDER BY timestamp LIMIT ?
+    )
+"""
+
+# Hourly buckets ("2024-01-01T13") of whole days before the cutoff day
+# are merged into daily ones ("2024-01-01")
+MERGE_HOURLY = """
+    INSERT INTO usage_rollup (bucket, endpoint, payload, count)
+    SELECT substr(bucket, 1, 10), endpoint, payload, SUM(count)
+    FROM usage_rollup
+    WHERE bucket < ? AND length(bucket) = 13
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, endpoint, payload) DO UPDATE
+    SET count = count + excluded.count
+"""
+
+DELETE_HOURLY = "DELETE FROM usage_rollup WHERE bucket < ? AND length(bucket) = 13"
+
+DELETE_DAILY = "DELETE FROM usage_rollup WHERE bucket < ? AND length(bucket) = 10"
+
+
+def delete_raw_rows(
+    conn: sqlite3.Connection, before: str, batch_size: int, pause: float = 0.0
+) -> int:
+    """Delete raw rows logged before ``before``, one short transaction each.
+
+    The rollup already counts them. Between batches the writer gets the
+    lock back and freed pages are returned to the filesystem.
+    """
+    deleted = 0
+    while True:
+        with conn:
+            count = conn.execute(DELETE_RAW_BATCH, (before, batch_size)).rowcount
+        deleted += count
+        # Give back roughly what the batch freed (no-op without auto_vacuum).
+        # executescript steps it to completion; execute frees a single page.
+        conn.executescript(f"PRAGMA incremental_vacuum({int(batch_size)})")
+        if count < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+def merge_hourly_rollups(conn: sqlite3.Connection, before_day: str) -> int:
+    """Fold hourly rollup buckets older than ``before_day`` into daily ones."""
+    # IMMEDIATE: another worker's run must not merge the same hours
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(MERGE_HOURLY, (before_day,))
+        merged = conn.execute(DELETE_HOURLY, (before_day,)).rowcount
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return merged
+
+
+def delete_daily_rollups(conn: sqlite3.Connection, before_day: str) -> int:
+    """Delete daily rollup buckets older than ``before_day``."""
+    with conn:
+        return conn.execute(DELETE_DAILY, (before_day,)).rowcount
+
+
+def run_retention(
+    path: Optional[str] = None,
+    raw_hours: Optional[float] = None,
+    hourly_days: Optional[float] = None,
+    daily_days: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """One retention pass over the usage database; returns what it did."""
+    now = now or datetime.utcnow()
+    raw_hours = config.USAGE_RAW_RETENTION_HOURS if raw_hours is None else raw_hours
+    if hourly_days is None:
+        hourly_days = config.USAGE_HOURLY_RETENTION_DAYS
+    if daily_days is None:
+        daily_days = config.USAGE_DAILY_RETENTION_DAYS
+    batch_size = batch_size or config.USAGE_RETENTION_BATCH
+
+    conn = get_connection(path)
+    raw_cutoff = (now - timedelta(hours=raw_hours)).isoformat()
+    day_cutoff = (now - timedelta(days=hourly_days)).isoformat()[:10]
+    daily_cutoff = (now - timedelta(days=daily_days)).isoformat()[:10]
+    result = {
+        "raw_deleted": delete_raw_rows(conn, raw_cutoff, batch_size, pause=0.01),
+        "hourly_merged": merge_hourly_rollups(conn, day_cutoff),
+        "daily_deleted": delete_daily_rollups(conn, daily_cutoff),
+        "free_pages": conn.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+    logger.info("Usage retention: %s", result)
+    return result
+
+
+class RetentionScheduler(PeriodicThread):
+    """Background thread running ``run_retention`` every ``interval`` seconds."""
+
+    def __init__(self, interval: float, path: Optional[str] = None):
+        super().__init__("usage-retention", interval, run_retention, path)
+        self.path = path
+
+
+if __name__ == "__main__":
+    # One-off pass, e.g. from cron when the scheduler is disabled
+    logging.basicConfig(level=logging.INFO)
+    print(run_retention())
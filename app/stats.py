@@ -0,0 +1,52 @@
+import math
+from typing import Optional
+
+from app.records import PlayerStatsRecord
+
+
+def _count(stats, column: str) -> float:
+    # Null upstream for stats not tracked yet (e.g. STL, BLK and TOV before
+    # the mid-1970s), which the record keeps as unknown
+    value = stats[column]
+    return math.nan if value is None else value
+
+
+def player_stats_from_totals(
+    stats, usage_rate: Optional[float] = None
+) -> PlayerStatsRecord:
+    """Per-game and shooting stats from one season-totals row.
+
+    ``stats`` is any mapping with the stats.nba.com totals columns (GP,
+    PTS, FGA, ...), e.g. a career or league dashboard row. ``usage_rate``
+    comes from app.team_stats since it needs team totals.
+    """
+    gp = stats["GP"]
+    pts = stats["PTS"]
+    fga = stats["FGA"]
+    fta = _count(stats, "FTA")
+
+    # Defensive fallback if stats are missing
+    if not gp or not fga or pts is None:
+        raise ValueError("Insufficient data for this player")
+
+    # Calculate advanced stats
+    ppg = round(pts / gp, 1)
+    ts_pct = round(pts / (2 * (fga + 0.44 * fta)), 3)
+
+    # Same order as app.records.STAT_FIELDS
+    values = (
+        ppg,
+        ts_pct,
+        round(_count(stats, "REB") / gp, 1),
+        round(_count(stats, "AST") / gp, 1),
+        round(_count(stats, "STL") / gp, 1),
+        round(_count(stats, "BLK") / gp, 1),
+        round(_count(stats, "TOV") / gp, 1),
+        # Percentages are null upstream for seasons without attempts
+        round(stats["FG_PCT"] or 0.0, 3),
+        round(stats["FG3_PCT"] or 0.0, 3),
+        round(stats["FT_PCT"] or 0.0, 3),
+        round(_count(stats, "MIN") / gp, 1),
+        math.nan if usage_rate is None else usage_rate,
+    )
+    return PlayerStatsRecord(values, stats["TEAM_ABBREVIATION"])
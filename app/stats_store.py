@@ -0,0 +1,81 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional, Tuple
+
+# Season key for "the player's most recent season"
+LATEST_SEASON = "latest"
+# Season key for the player's whole career table
+CAREER = "career"
+
+
+class StatsStore:
+    """SQLite-backed stats cache keyed by (player_id, season).
+
+    Holds each player's upstream career table and sits under the
+    in-memory TTLCache, so a restarted worker can serve the last fetched
+    stats without going upstream.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS season_totals (
+                player_id INTEGER NOT NULL,
+                season TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (player_id, season)
+            )
+        """
+        )
+        self._conn.commit()
+
+    def get(self, key: Tuple[int, str]) -> Optional[Tuple[Any, float]]:
+        """Return ``(value, age_seconds)`` or None if nothing is stored."""
+        player_id, season = key
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM season_totals "
+                "WHERE player_id = ? AND season = ?",
+                (player_id, season),
+            ).fetchone()
+        if row is None:
+            return None
+        payload, fetched_at = row
+        return json.loads(payload), max(0.0, time.time() - fetched_at)
+
+    def set(self, key: Tuple[int, str], value: Any):
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[Tuple[int, str], Any]]):
+        """Write many entries in a single transaction."""
+        now = time.time()
+        rows = [
+            (player_id, season, json.dumps(value), now)
+            for (player_id, season), value in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO season_totals "
+                "(player_id, season, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete(self, key: Tuple[int, str]):
+        player_id, season = key
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM season_totals WHERE player_id = ? AND season = ?",
+                (player_id, season),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,106 @@
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app import config
+from app.cache import TTLCache
+from app.providers import get_provider
+
+logger = logging.getLogger(__name__)
+
+
+def usage_rate(fga, fta, tov, minutes, team_minutes, team_possessions):
+    """USG%: share of team plays a player used while on the floor.
+
+    100 * (FGA + 0.44 * FTA + TOV) * (Tm MIN / 5)
+        / (MIN * (Tm FGA + 0.44 * Tm FTA + Tm TOV))
+
+    stats.nba.com team MIN is game minutes (player minutes / 5), so it is
+    used as-is. Works on scalars and NumPy arrays alike.
+    """
+    return 100 * (fga + 0.44 * fta + tov) * team_minutes / (minutes * team_possessions)
+
+
+class TeamTotals:
+    """One season's team totals (minutes and plays), indexed by TEAM_ID.
+
+    Players without a matching team (e.g. the TOT row of a traded player)
+    fall back to the league-average team.
+    """
+
+    def __init__(self, season: str, table):
+        team_ids = np.asarray(table["TEAM_ID"], dtype=np.int64)
+        minutes = np.asarray(table["MIN"], dtype=np.float64)
+        possessions = (
+            np.asarray(table["FGA"], dtype=np.float64)
+            + 0.44 * np.asarray(table["FTA"], dtype=np.float64)
+            + np.asarray(table["TOV"], dtype=np.float64)
+        )
+        order = np.argsort(team_ids)
+
+        self.season = season
+        self.team_ids = team_ids[order]
+        self.minutes = minutes[order]
+        self.possessions = possessions[order]
+        if len(order):
+            self.average = (float(minutes.mean()), float(possessions.mean()))
+        else:
+            self.average = (np.nan, np.nan)
+
+    def __len__(self):
+        return len(self.team_ids)
+
+    def lookup(self, team_id: int) -> Tuple[float, float]:
+        minutes, possessions = self.align(np.array([team_id], dtype=np.int64))
+        return float(minutes[0]), float(possessions[0])
+
+    def align(self, team_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Team (minutes, possessions) for each entry of ``team_ids``."""
+        if not len(self.team_ids):
+            missing = np.full(len(team_ids), np.nan)
+            return missing, missing.copy()
+        pos = np.searchsorted(self.team_ids, team_ids)
+        pos = np.minimum(pos, len(self.team_ids) - 1)
+        found = self.team_ids[pos] == team_ids
+        minutes = np.where(found, self.minutes[pos], self.average[0])
+        possessions = np.where(found, self.possessions[pos], self.average[1])
+        return minutes, possessions
+
+
+# One bulk team request per season fills every team of that season. Room
+# for every season since 1946-47, so old seasons never evict the ingested one.
+team_cache = TTLCache(maxsize=128, ttl=config.STATS_TTL_SECONDS)
+
+
+def get_team_totals(season: str) -> TeamTotals:
+    return team_cache.get(season, fetch_team_totals, season)
+
+
+def fetch_team_totals(season: str) -> TeamTotals:
+    return TeamTotals(season, get_provider().team_totals(season))
+
+
+def player_usage_rate(totals, season: str) -> Optional[float]:
+    """USG% for one player's season-totals row, None if it can't be derived."""
+    counts = [totals[column] for column in ("FGA", "FTA", "TOV", "MIN")]
+    # Early seasons have null TOV/MIN upstream
+    if None in counts or not totals["MIN"]:
+        return None
+    try:
+        teams = get_team_totals(season)
+    except Exception:
+        # Usage is a nice-to-have; don't fail the player's stats over it
+        logger.exception("Team totals unavailable for %s", season)
+        return None
+
+    team_minutes, team_possessions = teams.lookup(int(totals["TEAM_ID"]))
+    usage = usage_rate(
+        totals["FGA"],
+        totals["FTA"],
+        totals["TOV"],
+        totals["MIN"],
+        team_minutes,
+        team_possessions,
+    )
+    return round(float(usage), 1) if np.isfinite(usage) else None
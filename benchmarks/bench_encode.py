@@ -0,0 +1,61 @@
+"""Response encoding throughput: FastAPI's default path vs. orjson.
+
+The default path is what a route returning a dict costs: jsonable_encoder
+followed by the stdlib encoder. Payloads mirror /compare and /lineup.
+
+    python -m benchmarks.bench_encode
+"""
+
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.records import STAT_FIELDS
+from app.responses import ORJSONResponse, orjson
+
+ROUNDS = 20_000
+
+
+def player(rng: random.Random, name: str) -> dict:
+    stats = {field: round(rng.uniform(0, 40), 1) for field in STAT_FIELDS}
+    return dict(stats, team="LAL", name=name)
+
+
+def payloads():
+    rng = random.Random(0)  # nosec B311
+    compare = {
+        "player1": player(rng, "Lebron James"),
+        "player2": player(rng, "Stephen Curry"),
+    }
+    lineup = {
+        "lineup": ["Lebron James", "Stephen Curry", "Kevin Durant", "Nikola Jokic"],
+        "metric": "avg",
+        **{f"avg_{field}": round(rng.uniform(0, 40), 2) for field in STAT_FIELDS},
+    }
+    return {"compare": compare, "lineup": lineup}
+
+
+def per_second(fn, payload) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(payload)
+    return ROUNDS / (time.perf_counter() - start)
+
+
+def main():
+    encoders = {"default": lambda p: JSONResponse(jsonable_encoder(p)).body}
+    if orjson is not None:
+        encoders["orjson"] = lambda p: ORJSONResponse(p).body
+    else:
+        print("orjson is not installed; only the default path is timed")
+
+    for label, payload in payloads().items():
+        rates = {name: per_second(fn, payload) for name, fn in encoders.items()}
+        line = "  ".join(f"{name} {rate:9.0f}/s" for name, rate in rates.items())
+        print(f"{label:<8} {line}")
+
+
+if __name__ == "__main__":
+    main()
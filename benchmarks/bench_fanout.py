@@ -0,0 +1,69 @@
+"""Cold /lineup and /compare latency with an injected upstream delay.
+
+Runs offline against the fixture provider. Each round clears the stats,
+career and response caches so every player is a cold fetch; the
+sequential baseline calls get_cached_player_stats one player at a time,
+as the routes used to.
+
+    python -m benchmarks.bench_fanout [delay_ms]
+"""
+
+import os
+import sys
+import time
+
+DELAY_MS = sys.argv[1] if len(sys.argv) > 1 else "100"
+os.environ["STATS_PROVIDER"] = "fixtures"
+os.environ["STATS_FIXTURE_DELAY_MS"] = DELAY_MS
+os.environ["STATS_DB_FILE"] = ""
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import main  # noqa: E402
+
+LINEUP = [
+    "lebron-james",
+    "stephen-curry",
+    "kevin-durant",
+    "nikola-jokic",
+    "jayson-tatum",
+]
+ROUNDS = 5
+
+
+def timed(fn):
+    timings = []
+    for _ in range(ROUNDS):
+        main.stats_cache.clear()
+        main.career_cache.clear()
+        main.response_cache.clear()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings) * 1e3
+
+
+def run():
+    client = TestClient(main.app)
+    ids = [main.get_player_id(slug) for slug in LINEUP]
+
+    def sequential():
+        for player_id in ids:
+            main.get_cached_player_stats(player_id)
+
+    def lineup():
+        response = client.post("/lineup", json={"players": LINEUP})
+        assert response.status_code == 200
+
+    def compare():
+        response = client.get("/compare?player1=lebron-james&player2=kevin-durant")
+        assert response.status_code == 200
+
+    print(f"upstream delay {DELAY_MS} ms, {len(LINEUP)}-man lineup")
+    print(f"sequential fetch   {timed(sequential):8.1f} ms")
+    print(f"/lineup fan-out    {timed(lineup):8.1f} ms")
+    print(f"/compare fan-out   {timed(compare):8.1f} ms")
+
+
+if __name__ == "__main__":
+    run()
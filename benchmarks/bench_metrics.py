@@ -0,0 +1,54 @@
+"""Derived metrics for a whole league: NumPy pass vs. per-player scalar math.
+
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+
+import numpy as np
+
+from app.league_store import STAT_COLUMNS, LeagueStore
+from app.metrics import DerivedMetrics
+from app.stats import player_stats_from_totals
+
+
+def synthetic_league(n: int) -> dict:
+    rng = np.random.default_rng(0)
+    table = {name: rng.uniform(0, 2000, n).round() for name in STAT_COLUMNS}
+    table["GP"] = rng.integers(0, 83, n)
+    for name in ("FG_PCT", "FG3_PCT", "FT_PCT"):
+        table[name] = rng.uniform(0.2, 0.9, n)
+    table["PLAYER_ID"] = np.arange(n)
+    table["TEAM_ID"] = np.full(n, 1610612747)
+    table["TEAM_ABBREVIATION"] = ["LAL"] * n
+    return table
+
+
+def best_of(fn, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def scalar(snapshot):
+    for player_id in snapshot.rows:
+        try:
+            player_stats_from_totals(snapshot.row(player_id))
+        except ValueError:
+            pass
+
+
+def main():
+    for n in (500, 5000):
+        store = LeagueStore()
+        snapshot = store.load("bench", synthetic_league(n))
+        vectorized = best_of(lambda: DerivedMetrics(snapshot))
+        looped = best_of(lambda: scalar(snapshot), repeat=3)
+        print(f"{n:>5} players  numpy {vectorized:7.2f} ms  scalar {looped:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cold-fetch parsing: pandas DataFrames vs. raw resultSets parsing.
+
+Replays recorded career payloads (tests/fixtures) plus a synthetic
+20-season career, timing CPU and peak allocation per fetch for the old
+``get_data_frames()[0].iloc[-1]`` path and the Table path now used.
+
+    python -m benchmarks.bench_parse
+"""
+
+import glob
+import json
+import os
+import time
+import tracemalloc
+
+from app import config
+from app.career import season_totals
+from app.providers import CAREER_TABLE, synthetic_career_payload
+from app.resultsets import parse_result_set
+from app.stats_store import LATEST_SEASON
+
+ROUNDS = 500
+
+
+def dataframe_path(text):
+    import pandas as pd
+
+    payload = json.loads(text)
+    result_set = payload["resultSets"][0]
+    frame = pd.DataFrame(result_set["rowSet"], columns=result_set["headers"])
+    return frame.iloc[-1].to_dict()
+
+
+def table_path(text):
+    career = parse_result_set(json.loads(text), CAREER_TABLE)
+    return season_totals(career, LATEST_SEASON)
+
+
+def measure(fn, payloads):
+    fn(payloads[0])  # warm imports
+    start = time.process_time()
+    for i in range(ROUNDS):
+        fn(payloads[i % len(payloads)])
+    cpu = (time.process_time() - start) / ROUNDS
+
+    tracemalloc.start()
+    for text in payloads:
+        fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu * 1e6, peak / 1024
+
+
+def main():
+    pattern = os.path.join(config.STATS_FIXTURES_DIR, "career", "*.json")
+    payloads = [open(path).read() for path in sorted(glob.glob(pattern))]
+    payloads.append(json.dumps(synthetic_career_payload(1, seasons=20)))
+
+    for label, fn in (("DataFrame", dataframe_path), ("Table", table_path)):
+        cpu, peak = measure(fn, payloads)
+        print(f"{label:<10} {cpu:8.1f} us CPU/fetch  {peak:8.1f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
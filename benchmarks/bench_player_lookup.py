@@ -0,0 +1,67 @@
+"""Miss latency of get_player_id: linear scan vs. PlayerDirectory.
+
+Also times the fuzzy (trigram) fallback used on the 404 path and the
+prefix completion behind /players/search.
+
+Run from the repo root with ``python -m benchmarks.bench_player_lookup``.
+"""
+
+import time
+
+from nba_api.stats.static import players
+
+from app.player_directory import PlayerDirectory
+
+
+def linear_lookup(player_list, name):
+    name = name.lower().replace("-", " ")
+    for player in player_list:
+        if player["full_name"].lower() == name:
+            return player["id"]
+    return None
+
+
+def bench(label, fn, names):
+    start = time.perf_counter()
+    for name in names:
+        fn(name)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed / len(names) * 1e6:10.2f} us/lookup")
+
+
+def bench_p99(label, fn, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"{label:<12} {p99 * 1e6:10.2f} us p99")
+
+
+def main():
+    player_list = players.get_players()
+    # Slugs for every player, so each one is a cold lookup
+    names = [p["full_name"].lower().replace(" ", "-") for p in player_list]
+    names.append("unknown-player")
+    print(f"{len(player_list)} players, {len(names)} lookups")
+
+    bench("linear scan", lambda n: linear_lookup(player_list, n), names)
+
+    start = time.perf_counter()
+    directory = PlayerDirectory(player_list)
+    print(f"index build  {(time.perf_counter() - start) * 1e3:10.2f} ms")
+    bench("index", directory.lookup, names)
+
+    # Drop a letter from every surname to force the fuzzy path
+    typos = [name[:-2] + name[-1] for name in names]
+    bench("fuzzy", directory.search, typos)
+
+    # Every 1-4 character keystroke prefix of every name
+    prefixes = sorted({n[:i] for n in names for i in range(1, 5)})
+    bench_p99("complete", directory.complete, prefixes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Hot /player requests through the whole ASGI app: cached bodies vs. encoding.
+
+Runs offline against the fixture provider with the stats already cached.
+Each request goes through routing, parameter parsing, usage logging and
+the threadpool hop like a real one; only the server and network are left
+out. The baseline row rebuilds the body and its validators per request.
+
+    python -m benchmarks.bench_player_response
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ["STATS_PROVIDER"] = "fixtures"
+os.environ["STATS_DB_FILE"] = ""
+os.environ["USAGE_DB_FILE"] = os.path.join(tempfile.mkdtemp(), "usage.db")
+
+from app import main  # noqa: E402
+from app.response_cache import CachedBody  # noqa: E402
+
+PLAYERS = ["lebron-james", "stephen-curry", "kevin-durant"]
+REQUESTS = 5_000
+
+
+def encode_each_time(player_id, season=None):
+    stats = main.get_cached_player_stats(player_id, season)
+    body = main.APIResponse(stats.to_dict()).body
+    return CachedBody(None, stats, body, time.time())
+
+
+async def get(path: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await main.app(scope, receive, send)
+    assert status == [200], status
+
+
+async def throughput() -> float:
+    paths = [f"/player/{slug}" for slug in PLAYERS]
+    for path in paths:
+        await get(path)  # warm every cache
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        await get(paths[i % len(paths)])
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def run():
+    cached = asyncio.run(throughput())
+    player_body = main.player_body
+    main.player_body = encode_each_time
+    try:
+        encoded = asyncio.run(throughput())
+    finally:
+        main.player_body = player_body
+    print(f"encode per request  {encoded:10.0f} req/s")
+    print(f"cached bytes        {cached:10.0f} req/s  ({cached / encoded:.2f}x)")
+
+
+if __name__ == "__main__":
+    run()
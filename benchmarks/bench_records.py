@@ -0,0 +1,43 @@
+"""Memory held by cached player stats: PlayerStatsRecord vs. plain dicts.
+
+    python -m benchmarks.bench_records
+"""
+
+import random
+import tracemalloc
+
+from app.records import STAT_FIELDS, PlayerStatsRecord
+
+TEAMS = ["LAL", "GSW", "PHX", "BOS", "DEN", "MIA"]
+
+
+def synthetic_stats(n: int):
+    rng = random.Random(0)  # nosec B311
+    for _ in range(n):
+        stats = {field: round(rng.uniform(0, 40), 1) for field in STAT_FIELDS}
+        stats["team"] = rng.choice(TEAMS)
+        yield stats
+
+
+def measure(build, n: int) -> int:
+    # Rows are generated under tracing so dicts are charged for their floats
+    tracemalloc.start()
+    held = [build(stats) for stats in synthetic_stats(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def main():
+    for n in (10_000, 50_000):
+        as_dicts = measure(dict, n)
+        as_records = measure(PlayerStatsRecord.from_dict, n)
+        print(
+            f"{n:>6} entries  dict {as_dicts / n:6.0f} B/entry"
+            f"  record {as_records / n:6.0f} B/entry"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Usage-log inserts from several worker processes writing at once.
+
+Compares the old per-call pattern (connect, rollback journal, insert,
+commit, close) with the long-lived WAL connection, and with the batched
+UsageLogWriter. Counts "database is locked" errors for each.
+
+    python -m benchmarks.bench_usage_log [workers] [rows_per_worker]
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from app.db import INSERT_USAGE, UsageLogWriter, get_connection, init_db
+from app.migrations import migrate
+
+ROW = ("2024-01-01T00:00:00", "/player", "lebron-james")
+
+
+def per_call(path, count):
+    errors = 0
+    for _ in range(count):
+        try:
+            conn = sqlite3.connect(path, timeout=0.1)
+            conn.execute(INSERT_USAGE, ROW)
+            conn.commit()
+            conn.close()
+        except sqlite3.OperationalError:
+            errors += 1
+    return errors
+
+
+def long_lived(path, count):
+    errors = 0
+    conn = get_connection(path)
+    for _ in range(count):
+        try:
+            with conn:
+                conn.execute(INSERT_USAGE, ROW)
+        except sqlite3.OperationalError:
+            errors += 1
+    return errors
+
+
+def batched(path, count):
+    writer = UsageLogWriter(path)
+    for _ in range(count):
+        writer.log(*ROW[1:])
+    writer.stop()
+    return writer.errors
+
+
+def worker(mode, path, count, results):
+    results.put(globals()[mode](path, count))
+
+
+def run(mode, workers, count):
+    path = os.path.join(tempfile.mkdtemp(), "usage.db")
+    if mode == "per_call":
+        # The old default: rollback journal
+        conn = sqlite3.connect(path)
+        migrate(conn)
+        conn.close()
+    else:
+        init_db(path)
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=worker, args=(mode, path, count, results))
+        for _ in range(workers)
+    ]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    errors = sum(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - start
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT COUNT(*) FROM usage_log").fetchone()[0]
+    conn.close()
+    print(f"{mode:<10} {rows / elapsed:10.0f} rows/s  {errors:5d} lock errors")
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    print(f"{workers} workers x {count} rows")
+    for mode in ("per_call", "long_lived", "batched"):
+        run(mode, workers, count)
+
+
+if __name__ == "__main__":
+    main()
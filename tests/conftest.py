@@ -0,0 +1,25 @@
+# tests/conftest.py
+import os
+import tempfile
+
+import pytest
+
+# Run the suite offline against recorded fixtures unless told otherwise,
+# e.g. `STATS_PROVIDER=nba_api pytest` to hit stats.nba.com.
+os.environ.setdefault("STATS_PROVIDER", "fixtures")
+os.environ.setdefault("STATS_DB_FILE", "")
+os.environ.setdefault(
+    "USAGE_DB_FILE", os.path.join(tempfile.mkdtemp(), "usage_tracking.db")
+)
+
+from app import config  # noqa: E402
+from app.career import season_totals as season_row  # noqa: E402
+from app.providers import FixtureProvider  # noqa: E402
+from app.stats_store import LATEST_SEASON  # noqa: E402
+
+
+@pytest.fixture
+def season_totals():
+    """One upstream season-totals row (LeBron James, 2023-24)."""
+    provider = FixtureProvider(config.STATS_FIXTURES_DIR)
+    return season_row(provider.career_totals(2544), LATEST_SEASON)
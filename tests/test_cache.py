@@ -0,0 +1,149 @@
+# tests/test_cache.py
+
+import gc
+import threading
+import weakref
+
+import pytest
+
+from app.cache import DerivedCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, key):
+        self.calls += 1
+        self.release.wait(5)
+        return f"{key}-v{self.calls}"
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(ttl=60, clock=FakeClock())
+    upstream = Upstream()
+
+    assert cache.get("a", upstream, "a") == "a-v1"
+    assert cache.get("a", upstream, "a") == "a-v1"
+
+    assert upstream.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_stale_value_served_while_refreshing():
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, clock=clock)
+    upstream = Upstream()
+    cache.get("a", upstream, "a")
+
+    clock.now = 61
+    upstream.release.clear()
+    # Returned immediately even though the refresh is blocked upstream
+    assert cache.get("a", upstream, "a") == "a-v1"
+    assert cache.get("a", upstream, "a") == "a-v1"
+    upstream.release.set()
+    cache._pool.shutdown(wait=True)
+
+    assert upstream.calls == 2
+    assert cache.stats()["stale"] == 2
+    assert cache.get("a", upstream, "a") == "a-v2"
+
+
+def test_expired_beyond_max_stale_reloads_inline():
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, max_stale=60, clock=clock)
+    upstream = Upstream()
+    cache.get("a", upstream, "a")
+
+    clock.now = 121
+    assert cache.get("a", upstream, "a") == "a-v2"
+    assert cache.stats()["misses"] == 2
+
+
+def test_contains_only_values_served_without_loading():
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, max_stale=60, clock=clock)
+    assert "a" not in cache
+    cache.get("a", Upstream(), "a")
+
+    clock.now = 61
+    assert "a" in cache  # stale, but still served
+    clock.now = 121
+    assert "a" not in cache
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, clock=FakeClock())
+    upstream = Upstream()
+    for key in ("a", "b", "a", "c"):
+        cache.get(key, upstream, key)
+
+    assert cache.stats()["evictions"] == 1
+    cache.get("a", upstream, "a")
+    assert cache.stats()["hits"] == 2
+
+
+def test_errors_are_not_cached():
+    cache = TTLCache(clock=FakeClock())
+
+    def failing(key):
+        raise ValueError("Insufficient data for this player")
+
+    with pytest.raises(ValueError):
+        cache.get("a", failing, "a")
+    assert len(cache) == 0
+
+
+def test_derived_value_follows_its_source():
+    cache = DerivedCache()
+    upstream = Upstream()
+
+    assert cache.get("a", 1, upstream, "a") == "a-v1"
+    assert cache.get("a", 1, upstream, "a") == "a-v1"
+    # A refreshed source has a new version: rebuild from it
+    assert cache.get("a", 2, upstream, "a") == "a-v2"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_versions_change_on_reload():
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, max_stale=60, clock=clock)
+    upstream = Upstream()
+    value, version = cache.get_versioned("a", upstream, "a")
+    assert cache.get_versioned("a", upstream, "a") == (value, version)
+
+    clock.now = 121
+    value, reloaded = cache.get_versioned("a", upstream, "a")
+    assert value == "a-v2"
+    assert reloaded != version
+
+
+def test_evicted_source_is_freed_while_derived_value_stays():
+    class Career(dict):
+        pass
+
+    sources = TTLCache(maxsize=1, clock=FakeClock())
+    derived = DerivedCache()
+    career, version = sources.get_versioned(1, Career)
+    ref = weakref.ref(career)
+    derived.get(1, version, len, career)
+
+    sources.get(2, Career)  # evicts the first career
+    del career
+    gc.collect()
+
+    assert ref() is None
+    assert derived.get(1, version, len, None) == 0
+    assert derived.stats()["hits"] == 1
@@ -0,0 +1,24 @@
+# tests/test_career.py
+
+from app.career import season_totals
+from app.stats_store import LATEST_SEASON
+
+CAREER = {
+    "SEASON_ID": ["2022-23", "2022-23", "2022-23", "2023-24"],
+    "TEAM_ABBREVIATION": ["BKN", "PHX", "TOT", "PHX"],
+    "PTS": [1120, 192, 1312, 2041],
+}
+
+
+def test_season_totals_picks_tot_row():
+    assert season_totals(CAREER, "2022-23") == {
+        "SEASON_ID": "2022-23",
+        "TEAM_ABBREVIATION": "TOT",
+        "PTS": 1312,
+    }
+
+
+def test_season_totals_latest_and_missing():
+    assert season_totals(CAREER, LATEST_SEASON)["PTS"] == 2041
+    assert season_totals(CAREER, "1990-91") is None
+    assert season_totals({}, LATEST_SEASON) is None
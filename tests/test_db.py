@@ -0,0 +1,120 @@
+# tests/test_db.py
+
+import multiprocessing
+import sqlite3
+import time
+from datetime import datetime
+
+from app.db import (
+    INSERT_USAGE,
+    UsageLogWriter,
+    get_connection,
+    init_db,
+    usage_summary,
+)
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM usage_log").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_flush_writes_every_logged_row(tmp_path):
+    path = str(tmp_path / "usage.db")
+    writer = UsageLogWriter(path, batch_size=10, flush_interval=60)
+    for i in range(25):
+        writer.log("/player", f"player-{i}")
+    assert writer.flush()
+    assert count_rows(path) == 25
+    assert writer.written == 25
+    writer.stop()
+
+
+def test_batches_written_after_interval(tmp_path):
+    path = str(tmp_path / "usage.db")
+    writer = UsageLogWriter(path, batch_size=1000, flush_interval=0.01)
+    writer.log("/compare", "a vs b")
+    deadline = time.monotonic() + 5
+    while writer.written == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count_rows(path) == 1
+    writer.stop()
+
+
+def test_stop_writes_queued_rows(tmp_path):
+    path = str(tmp_path / "usage.db")
+    writer = UsageLogWriter(path, batch_size=1000, flush_interval=60)
+    for _ in range(3):
+        writer.log("/player", "lebron-james")
+    writer.stop()
+    assert count_rows(path) == 3
+
+
+def insert_rows(path, count):
+    # One transaction per row: the most lock-heavy way to write
+    conn = get_connection(path)
+    for i in range(count):
+        with conn:
+            conn.execute(INSERT_USAGE, ("2024-01-01T00:00:00", "/player", str(i)))
+
+
+def test_concurrent_workers_do_not_hit_lock_errors(tmp_path):
+    path = str(tmp_path / "usage.db")
+    init_db(path)
+    workers = [
+        multiprocessing.Process(target=insert_rows, args=(path, 200)) for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    # A "database is locked" error would fail the worker
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    assert count_rows(path) == 800
+
+
+def test_connection_reused_per_thread(tmp_path):
+    path = str(tmp_path / "usage.db")
+    assert get_connection(path) is get_connection(path)
+    mode = get_connection(path).execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_rollup_counts_follow_raw_rows(tmp_path):
+    path = str(tmp_path / "usage.db")
+    writer = UsageLogWriter(path, batch_size=2, flush_interval=60)
+    for payload in ["lebron-james", "stephen-curry", "lebron-james"]:
+        writer.log("/player", payload)
+    writer.log("/compare", "lebron-james vs stephen-curry")
+    writer.stop()
+
+    summary = usage_summary(path=path)
+    assert summary["total"] == 4
+    assert summary["endpoints"] == {"/player": 3, "/compare": 1}
+    assert summary["top_payloads"][0] == {
+        "endpoint": "/player",
+        "payload": "lebron-james",
+        "count": 2,
+    }
+    assert sum(bucket["count"] for bucket in summary["buckets"]) == 4
+    assert len(usage_summary(bucket="day", path=path)["buckets"][0]["bucket"]) == 10
+
+
+def test_rollup_backfilled_from_existing_rows(tmp_path):
+    path = str(tmp_path / "usage.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE usage_log (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " endpoint TEXT NOT NULL, payload TEXT, timestamp TEXT NOT NULL)"
+    )
+    now = datetime.utcnow().isoformat()
+    conn.executemany(INSERT_USAGE, [(now, "/player", "lebron-james")] * 3)
+    conn.commit()
+    conn.close()
+
+    init_db(path)
+    assert usage_summary(path=path)["endpoints"] == {"/player": 3}
@@ -0,0 +1,29 @@
+# tests/test_ingest.py
+
+from app.ingest import ingest_season
+from app.league_store import LeagueStore
+
+
+def test_ingest_loads_league_with_one_bulk_request():
+    store = LeagueStore()
+    assert ingest_season(store, "2023-24") == 3
+    assert store.snapshot.season == "2023-24"
+
+    totals = store.row(2544)
+    assert totals["TEAM_ABBREVIATION"] == "LAL"
+    assert totals["PTS"] == 1822
+    assert store.row(1) is None
+
+
+def test_traded_player_uses_season_total_row():
+    store = LeagueStore()
+    ingest_season(store, "2022-23")
+    assert store.row(201142)["GP"] == 47
+
+
+def test_reload_bumps_version():
+    store = LeagueStore()
+    ingest_season(store, "2022-23")
+    version = store.version
+    ingest_season(store, "2023-24")
+    assert store.version == version + 1
@@ -0,0 +1,47 @@
+# tests/test_league_store.py
+
+from app.league_store import STAT_COLUMNS, LeagueStore
+from app.resultsets import table_from_rows
+
+HEADERS = ["PLAYER_ID", "TEAM_ID", "TEAM_ABBREVIATION", *STAT_COLUMNS]
+
+
+def make_table(rows):
+    records = []
+    for player_id, team, gp, pts in rows:
+        record = dict.fromkeys(HEADERS, 0.0)
+        record.update(PLAYER_ID=player_id, TEAM_ABBREVIATION=team, GP=gp, PTS=pts)
+        records.append([record[header] for header in HEADERS])
+    return table_from_rows(HEADERS, records)
+
+
+def test_columns_are_contiguous_arrays():
+    store = LeagueStore()
+    store.load("2023-24", make_table([(1, "LAL", 10, 250), (2, "GSW", 20, 300)]))
+
+    pts = store.column("PTS")
+    assert pts.flags["C_CONTIGUOUS"]
+    assert pts.tolist() == [250.0, 300.0]
+    assert store.row(2)["TEAM_ABBREVIATION"] == "GSW"
+
+
+def test_leaders_per_game():
+    store = LeagueStore()
+    store.load(
+        "2023-24",
+        make_table([(1, "LAL", 10, 250), (2, "GSW", 20, 300), (3, "BOS", 0, 0)]),
+    )
+
+    leaders = store.snapshot.leaders("PTS", limit=5)
+    assert [leader["player_id"] for leader in leaders] == [1, 2]
+    assert leaders[0]["value"] == 25.0
+    assert store.snapshot.leaders("PTS", min_games=15)[0]["player_id"] == 2
+
+
+def test_memory_report_beats_dict_layout():
+    store = LeagueStore()
+    store.load("2023-24", make_table([(i, "LAL", 10, 100) for i in range(500)]))
+
+    report = store.memory_report()
+    assert report["players"] == 500
+    assert report["columnar_bytes_per_player"] < report["dict_bytes_per_player"]
@@ -0,0 +1,35 @@
+# tests/test_metrics.py
+
+import pytest
+
+from app.ingest import ingest_season
+from app.league_store import LeagueStore
+from app.metrics import derived_metrics
+from app.stats import player_stats_from_totals
+
+
+def test_matches_scalar_computation():
+    store = LeagueStore()
+    ingest_season(store, "2023-24")
+    metrics = derived_metrics(store.snapshot)
+
+    for player_id in (2544, 201939, 201142):
+        expected = player_stats_from_totals(store.row(player_id))
+        assert metrics.player(player_id).to_dict() == pytest.approx(expected.to_dict())
+
+
+def test_cached_until_next_refresh():
+    store = LeagueStore()
+    ingest_season(store, "2023-24")
+    metrics = derived_metrics(store.snapshot)
+    assert derived_metrics(store.snapshot) is metrics
+
+    ingest_season(store, "2023-24")
+    assert derived_metrics(store.snapshot) is not metrics
+    assert derived_metrics(store.snapshot).version == store.version
+
+
+def test_unknown_player_is_none():
+    store = LeagueStore()
+    ingest_season(store, "2023-24")
+    assert derived_metrics(store.snapshot).player(1) is None
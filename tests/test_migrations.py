@@ -0,0 +1,62 @@
+# tests/test_migrations.py
+
+import sqlite3
+
+import pytest
+
+from app.migrations import SCHEMA_VERSION, migrate, schema_version
+
+
+def objects(conn):
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE name NOT LIKE 'sqlite%'")
+    return {name for (name,) in rows}
+
+
+def test_fresh_database_migrated_once(tmp_path):
+    conn = sqlite3.connect(tmp_path / "usage.db")
+    assert migrate(conn) == SCHEMA_VERSION
+    assert schema_version(conn) == SCHEMA_VERSION
+    assert objects(conn) == {
+        "usage_log",
+        "usage_log_timestamp",
+        "usage_log_endpoint",
+        "usage_rollup",
+    }
+    assert migrate(conn) == 0
+
+
+def test_legacy_log_usage_table_normalized(tmp_path):
+    conn = sqlite3.connect(tmp_path / "usage.db")
+    # Shape the old log_usage created when it ran before init_db
+    conn.execute(
+        "CREATE TABLE usage_log (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " timestamp TEXT, endpoint TEXT, payload TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO usage_log (timestamp, endpoint, payload)"
+        " VALUES ('2024-01-01T10:00:00', '/player', 'lebron-james')"
+    )
+    conn.commit()
+
+    migrate(conn)
+
+    columns = conn.execute("PRAGMA table_info(usage_log)").fetchall()
+    assert [(c[1], c[3]) for c in columns] == [
+        ("id", 0),
+        ("endpoint", 1),
+        ("payload", 0),
+        ("timestamp", 1),
+    ]
+    assert conn.execute("SELECT endpoint, payload FROM usage_log").fetchall() == [
+        ("/player", "lebron-james")
+    ]
+    assert conn.execute("SELECT * FROM usage_rollup").fetchall() == [
+        ("2024-01-01T10", "/player", "lebron-james", 1)
+    ]
+
+
+def test_newer_schema_rejected(tmp_path):
+    conn = sqlite3.connect(tmp_path / "usage.db")
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    with pytest.raises(RuntimeError):
+        migrate(conn)
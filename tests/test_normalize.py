@@ -0,0 +1,16 @@
+# tests/test_normalize.py
+
+from app.normalize import normalize_name, strip_suffix
+
+
+def test_normalize_name():
+    assert normalize_name("Nikola Jokić") == "nikola jokic"
+    assert normalize_name("D'Angelo Russell") == "dangelo russell"
+    assert normalize_name(" lebron-james ") == "lebron james"
+    assert normalize_name("Larry Nance Jr.") == "larry nance jr"
+
+
+def test_strip_suffix():
+    assert strip_suffix("gary payton ii") == "gary payton"
+    assert strip_suffix("larry nance jr") == "larry nance"
+    assert strip_suffix("kevin v") == "kevin v"
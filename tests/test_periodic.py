@@ -0,0 +1,37 @@
+# tests/test_periodic.py
+
+import threading
+
+from app.periodic import PeriodicThread
+
+
+def test_run_first_calls_on_start():
+    called = threading.Event()
+    thread = PeriodicThread("test-periodic", 60, called.set, run_first=True)
+    thread.start()
+    assert called.wait(5)
+    thread.stop()
+
+
+def test_waits_an_interval_without_run_first():
+    calls = []
+    thread = PeriodicThread("test-periodic", 60, calls.append, 1)
+    thread.start()
+    thread.stop()
+    assert calls == []
+
+
+def test_keeps_running_after_a_failure():
+    calls = []
+    done = threading.Event()
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        done.set()
+
+    thread = PeriodicThread("test-periodic", 0.01, flaky)
+    thread.start()
+    assert done.wait(5)
+    thread.stop()
@@ -0,0 +1,79 @@
+# tests/test_player_directory.py
+
+from app.player_directory import PlayerDirectory, get_directory
+
+
+SAMPLE = [
+    {"id": 1, "full_name": "LeBron James"},
+    {"id": 2, "full_name": "Shai Gilgeous-Alexander"},
+    {"id": 3, "full_name": "LeBron James"},
+]
+
+
+def test_lookup_full_name_and_slug():
+    directory = PlayerDirectory(SAMPLE)
+    assert directory.lookup("LeBron James") == 1
+    assert directory.lookup("lebron-james") == 1
+    assert directory.lookup("  LEBRON JAMES ") == 1
+
+
+def test_lookup_hyphenated_surname():
+    directory = PlayerDirectory(SAMPLE)
+    assert directory.lookup("shai-gilgeous-alexander") == 2
+    assert directory.lookup("Shai Gilgeous-Alexander") == 2
+    assert directory.lookup("shai gilgeous alexander") == 2
+
+
+def test_lookup_miss():
+    assert PlayerDirectory(SAMPLE).lookup("unknown-player") is None
+
+
+def test_directory_is_built_once():
+    assert get_directory() is get_directory()
+    assert get_directory().lookup("lebron-james") == 2544
+
+
+def test_search_ranks_typos():
+    directory = get_directory()
+    results = directory.search("lebron-jmes")
+    assert results[0]["id"] == 2544
+    assert results == sorted(results, key=lambda r: -r["score"])
+
+
+def test_resolve_falls_back_to_fuzzy_match():
+    directory = get_directory()
+    assert directory.resolve("steph-curry") == directory.lookup("stephen-curry")
+    assert directory.resolve("unknown-player") is None
+
+
+def test_complete_ranks_active_players_first():
+    directory = PlayerDirectory(
+        [
+            {"id": 10, "full_name": "Gary Payton", "is_active": False},
+            {"id": 11, "full_name": "Gary Payton II", "is_active": True},
+            {"id": 12, "full_name": "Stephen Curry", "is_active": True},
+        ]
+    )
+    assert [r["id"] for r in directory.complete("gary")] == [11, 10]
+    assert [r["id"] for r in directory.complete("gary", limit=1)] == [11]
+    assert [r["id"] for r in directory.complete("cur")] == [12]
+    assert directory.complete("zz") == []
+
+
+def test_lookup_ignores_accents_punctuation_and_suffixes():
+    directory = PlayerDirectory(
+        [
+            {"id": 20, "full_name": "Nikola Jokić"},
+            {"id": 21, "full_name": "D'Angelo Russell"},
+            {"id": 22, "full_name": "Gary Payton"},
+            {"id": 23, "full_name": "Gary Payton II"},
+            {"id": 24, "full_name": "Larry Nance Jr."},
+        ]
+    )
+    assert directory.lookup("nikola-jokic") == 20
+    assert directory.lookup("dangelo-russell") == 21
+    assert directory.lookup("d-angelo-russell") == 21
+    assert directory.lookup("gary-payton") == 22
+    assert directory.lookup("gary-payton-ii") == 23
+    assert directory.lookup("larry-nance") == 24
+    assert directory.lookup("Larry Nance Jr") == 24
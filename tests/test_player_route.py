@@ -1,9 +1,17 @@
 # tests/test_player_route.py
 
+from concurrent.futures import ThreadPoolExecutor
 from fastapi.testclient import TestClient
+from app import config, main
 from app.main import app
 from app.main import get_cached_player_stats, get_player_id
+from app.cache import TTLCache
+from app.ingest import ingest_season
+from app.league_store import LeagueStore
+from app.records import PlayerStatsRecord
 import sqlite3
+import threading
+import time
 
 
 client = TestClient(app)
@@ -28,7 +36,7 @@ def test_get_cached_player_stats_for_known_player():
     lebron_id = get_player_id("lebron-james")
     stats = get_cached_player_stats(lebron_id)
 
-    assert isinstance(stats, dict)
+    assert isinstance(stats, PlayerStatsRecord)
     assert "points_per_game" in stats
     assert "true_shooting_pct" in stats
     assert "usage_rate" in stats
@@ -66,6 +74,7 @@ def test_lineup_stats_avg():
     assert "avg_minutes_per_game" in data
     assert isinstance(data["avg_points_per_game"], float)
     assert isinstance(data["avg_minutes_per_game"], float)
+    assert isinstance(data["avg_usage_rate"], float)
 
 
 def test_lineup_stats_total():
@@ -85,9 +94,306 @@ def test_lineup_stats_total():
 
 def test_usage_logging():
     client.get("/player/lebron-james")
-    conn = sqlite3.connect("usage_tracking.db")
+    assert main.usage_writer.flush()
+    conn = sqlite3.connect(config.USAGE_DB_FILE)
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM usage_log WHERE endpoint = '/player'")
+    cursor.execute(
+        "SELECT * FROM usage_log WHERE endpoint = '/player'"
+        " AND payload = 'lebron-james'"
+    )
     result = cursor.fetchone()
     conn.close()
     assert result is not None
+
+
+def test_search_players_prefix():
+    response = client.get("/players/search?prefix=lebr&limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"][0]["full_name"] == "LeBron James"
+    assert len(data["results"]) <= 5
+
+
+def test_lineup_fetches_players_concurrently(monkeypatch, season_totals):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_fetch(player_id, season):
+        with lock:
+            active.append(player_id)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(player_id)
+        return season_totals
+
+    monkeypatch.setattr(main, "fetch_season_totals", slow_fetch)
+    # Cold players: cached ones are served inline
+    main.stats_cache.clear()
+    main.career_cache.clear()
+    try:
+        response = client.post(
+            "/lineup",
+            json={"players": ["lebron-james", "stephen-curry", "kevin-durant"]},
+        )
+    finally:
+        main.stats_cache.clear()
+        main.career_cache.clear()
+
+    assert response.status_code == 200
+    assert response.json()["avg_points_per_game"] == round(1822 / 71, 1)
+    assert max(peak) > 1
+
+
+def test_warm_compare_skips_a_busy_fetch_pool(monkeypatch):
+    url = "/compare?player1=lebron-james&player2=stephen-curry"
+    assert client.get(url).status_code == 200  # both players now cached
+
+    # Every worker stuck on someone else's cold fetch
+    pool = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    pool.submit(release.wait, 10)
+    monkeypatch.setattr(main, "_fetch_pool", pool)
+    try:
+        start = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert response.status_code == 200
+    assert elapsed < 5
+
+
+def test_league_leaders(monkeypatch):
+    store = LeagueStore()
+    ingest_season(store, "2023-24")
+    monkeypatch.setattr(main, "league_store", store)
+
+    response = client.get("/league/leaders?stat=pts&limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["season"] == "2023-24"
+    assert [p["name"] for p in data["leaders"]] == ["Kevin Durant", "Stephen Curry"]
+
+    assert client.get("/league/leaders?stat=bogus").status_code == 400
+
+
+def test_player_stats_read_from_league_store(monkeypatch):
+    store = LeagueStore()
+    ingest_season(store, "2022-23")
+    monkeypatch.setattr(main, "league_store", store)
+
+    response = client.get("/player/kevin-durant")
+    assert response.status_code == 200
+    assert response.json()["team"] == "TOT"
+
+
+def test_league_store_player_without_team_totals(monkeypatch):
+    store = LeagueStore()
+    ingest_season(store, "2022-23")
+    monkeypatch.setattr(main, "league_store", store)
+
+    def unavailable(season):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(main, "team_cache", TTLCache())
+    monkeypatch.setattr(main, "fetch_team_totals", unavailable)
+    response = client.get("/player/kevin-durant")
+    assert response.status_code == 200
+    assert response.json()["usage_rate"] is None
+
+
+def test_player_stats_for_past_season():
+    response = client.get("/player/lebron-james?season=2021-22")
+    assert response.status_code == 200
+    assert response.json()["points_per_game"] == round(1711 / 56, 1)
+
+
+def test_player_stats_for_unknown_season():
+    response = client.get("/player/lebron-james?season=1990-91")
+    assert response.status_code == 404
+    assert client.get("/player/lebron-james?season=last").status_code == 422
+
+
+def test_one_career_fetch_fills_every_season(monkeypatch):
+    calls = []
+    career_totals = main.get_provider().career_totals
+
+    def counting(player_id):
+        calls.append(player_id)
+        return career_totals(player_id)
+
+    monkeypatch.setattr(main.get_provider(), "career_totals", counting)
+    main.stats_cache.clear()
+    main.career_cache.clear()
+    try:
+        for season in ("2023-24", "2022-23", "2021-22", "1990-91", None):
+            try:
+                get_cached_player_stats(2544, season)
+            except main.SeasonNotFound:
+                pass
+        client.get("/player/lebron-james/career")
+    finally:
+        main.stats_cache.clear()
+        main.career_cache.clear()
+
+    assert calls == [2544]
+
+
+def test_fuzzy_matches_show_the_matched_name():
+    response = client.get("/compare?player1=lebron-jmes&player2=stephen-curry")
+    assert response.status_code == 200
+    assert response.json()["player1"]["name"] == "LeBron James"
+    assert response.json()["player2"]["name"] == "Stephen Curry"
+
+    response = client.post("/lineup", json={"players": ["lebron-jmes"]})
+    assert response.json()["lineup"] == ["LeBron James"]
+
+
+def test_compare_and_lineup_accept_season():
+    response = client.get(
+        "/compare?player1=lebron-james&player2=stephen-curry&season=2022-23"
+    )
+    assert response.status_code == 200
+    assert response.json()["player1"]["points_per_game"] == round(1571 / 55, 1)
+
+    response = client.post(
+        "/lineup?season=2022-23",
+        json={"players": ["lebron-james", "kevin-durant"]},
+    )
+    assert response.status_code == 200
+
+
+def test_player_career():
+    response = client.get("/player/kevin-durant/career")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seasons"] == 2
+    assert data["columns"]["SEASON_ID"] == ["2022-23", "2022-23", "2022-23", "2023-24"]
+    assert data["columns"]["TEAM_ABBREVIATION"][-1] == "PHX"
+    assert client.get("/player/unknown-player/career").status_code == 404
+
+
+def test_player_body_cached_until_career_refresh(monkeypatch, season_totals):
+    totals = dict(season_totals)
+    monkeypatch.setattr(main, "fetch_season_totals", lambda pid, season: totals)
+    main.stats_cache.clear()
+    main.response_cache.clear()
+    try:
+        first = client.get("/player/lebron-james?season=2023-24")
+        second = client.get("/player/lebron-james?season=2023-24")
+        assert second.content == first.content
+        assert main.response_cache.stats()["hits"] >= 1
+
+        totals["PTS"] += 710
+        main.career_cache.invalidate((get_player_id("lebron-james"), main.CAREER))
+        refreshed = client.get("/player/lebron-james?season=2023-24")
+    finally:
+        main.stats_cache.clear()
+        main.response_cache.clear()
+
+    assert refreshed.json()["points_per_game"] == round((1822 + 710) / 71, 1)
+    assert refreshed.json()["points_per_game"] != first.json()["points_per_game"]
+
+
+def test_player_hit_skips_the_stats_lookup(monkeypatch):
+    first = client.get("/player/stephen-curry")
+
+    def unexpected(player_id, season=None):
+        raise AssertionError("stats looked up for a cached body")
+
+    monkeypatch.setattr(main, "get_cached_player_stats", unexpected)
+    second = client.get("/player/stephen-curry")
+    assert second.status_code == 200
+    assert second.content == first.content
+
+
+def test_player_conditional_get():
+    response = client.get("/player/lebron-james")
+    etag = response.headers["etag"]
+    assert "last-modified" in response.headers
+
+    cached = client.get("/player/lebron-james", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    stale = client.get("/player/lebron-james", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+    assert stale.json() == response.json()
+
+
+def test_compare_conditional_get():
+    url = "/compare?player1=lebron-james&player2=stephen-curry"
+    response = client.get(url)
+    etag = response.headers["etag"]
+
+    cached = client.get(url, headers={"If-None-Match": f'W/{etag}, "x"'})
+    assert cached.status_code == 304
+
+    swapped = client.get("/compare?player1=stephen-curry&player2=lebron-james")
+    assert swapped.headers["etag"] != etag
+
+
+def test_admin_usage_counts_requests():
+    client.get("/player/lebron-james")
+    assert main.usage_writer.flush()
+
+    response = client.get("/admin/usage?hours=1&top=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["endpoints"]["/player"] >= 1
+    assert len(data["top_payloads"]) <= 5
+
+
+def test_player_season_with_untracked_stats(monkeypatch, season_totals):
+    row = dict(season_totals, STL=None, BLK=None, TOV=None, MIN=None)
+    monkeypatch.setattr(main, "fetch_season_totals", lambda pid, season: row)
+    main.stats_cache.clear()
+    try:
+        response = client.get("/player/lebron-james?season=1961-62")
+    finally:
+        main.stats_cache.clear()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["turnovers_per_game"] is None
+    assert data["usage_rate"] is None
+
+
+def test_stats_follow_background_career_refresh(monkeypatch):
+    clock = [0.0]
+    career_cache = TTLCache(ttl=10, clock=lambda: clock[0])
+    monkeypatch.setattr(main, "career_cache", career_cache)
+    provider = main.get_provider()
+    career_totals = provider.career_totals
+    extra_points = [0]
+
+    def upstream(player_id):
+        career = career_totals(player_id)
+        career["PTS"] = career["PTS"][:-1] + [career["PTS"][-1] + extra_points[0]]
+        return career
+
+    monkeypatch.setattr(provider, "career_totals", upstream)
+    main.stats_cache.clear()
+    try:
+        assert get_cached_player_stats(2544, "2023-24")["points_per_game"] == 25.7
+
+        extra_points[0] = 710
+        clock[0] = 11  # stale: served as-is while the career refreshes
+        assert get_cached_player_stats(2544, "2023-24")["points_per_game"] == 25.7
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            stats = get_cached_player_stats(2544, "2023-24")
+            if stats["points_per_game"] != 25.7:
+                break
+            time.sleep(0.01)
+    finally:
+        main.stats_cache.clear()
+
+    # Picked up as soon as the career refresh landed, not a TTL later
+    assert stats["points_per_game"] == round((1822 + 710) / 71, 1)
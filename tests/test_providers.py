@@ -0,0 +1,57 @@
+# tests/test_providers.py
+
+import pytest
+
+from app import config, providers
+from app.providers import FixtureProvider, get_provider
+from app.resultsets import parse_result_set, table_len
+
+
+def test_fixture_provider_reads_recorded_payload():
+    career = FixtureProvider(config.STATS_FIXTURES_DIR).career_totals(2544)
+    assert career["TEAM_ABBREVIATION"][-1] == "LAL"
+    assert career["SEASON_ID"][-1] == "2023-24"
+    assert list(career) == providers.CAREER_HEADERS
+
+
+def test_fixture_provider_synthesizes_unknown_players(tmp_path):
+    provider = FixtureProvider(str(tmp_path))
+    career = provider.career_totals(123)
+    assert table_len(career) == 5
+    assert all(gp > 0 for gp in career["GP"])
+    assert career == provider.career_totals(123)
+
+
+def test_get_provider_uses_config(monkeypatch):
+    monkeypatch.setattr(config, "STATS_PROVIDER", "carrier-pigeon")
+    get_provider.cache_clear()
+    try:
+        with pytest.raises(ValueError):
+            get_provider()
+    finally:
+        get_provider.cache_clear()
+
+
+def test_parse_result_set():
+    payload = {
+        "resultSets": [
+            {"name": "Other", "headers": ["A"], "rowSet": [[0]]},
+            {"name": "Wanted", "headers": ["A", "B"], "rowSet": [[1, "x"], [2, "y"]]},
+        ]
+    }
+    assert parse_result_set(payload, "Wanted") == {"A": [1, 2], "B": ["x", "y"]}
+    assert parse_result_set(payload) == {"A": [0]}
+
+    empty = {"resultSets": [{"name": "Wanted", "headers": ["A"], "rowSet": []}]}
+    assert parse_result_set(empty, "Wanted") == {"A": []}
+    with pytest.raises(ValueError):
+        parse_result_set(payload, "Missing")
+
+
+def test_incomplete_provider_fails_at_construction():
+    class CareerOnly(providers.StatsProvider):
+        def career_totals(self, player_id):
+            return {}
+
+    with pytest.raises(TypeError):
+        CareerOnly()
@@ -0,0 +1,44 @@
+# tests/test_records.py
+
+import pytest
+
+from app.records import STAT_FIELDS, PlayerStatsRecord
+from app.stats import player_stats_from_totals
+
+
+def test_round_trips_through_dict(season_totals):
+    record = player_stats_from_totals(season_totals, usage_rate=31.2)
+    assert PlayerStatsRecord.from_dict(record.to_dict()) == record
+    assert list(record.to_dict()) == list(STAT_FIELDS) + ["team"]
+    assert record["usage_rate"] == 31.2
+    assert record["team"] == "LAL"
+
+
+def test_unknown_usage_rate_is_none(season_totals):
+    record = player_stats_from_totals(season_totals)
+    assert record["usage_rate"] is None
+    assert record.to_dict()["usage_rate"] is None
+
+
+def test_is_immutable(season_totals):
+    record = player_stats_from_totals(season_totals)
+    with pytest.raises(AttributeError):
+        record.team = "BOS"
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_fits_memory_budget(season_totals):
+    record = player_stats_from_totals(season_totals)
+    # A dict of the same fields costs ~750 bytes with its boxed floats
+    assert record.nbytes <= 256
+
+
+def test_untracked_counts_are_none(season_totals):
+    # Early seasons: no steals, blocks, turnovers or minutes upstream
+    row = dict(season_totals, STL=None, BLK=None, TOV=None, MIN=None)
+    record = player_stats_from_totals(row)
+    assert record["steals_per_game"] is None
+    assert record.to_dict()["turnovers_per_game"] is None
+    assert record.to_dict()["minutes_per_game"] is None
+    assert record["points_per_game"] == round(1822 / 71, 1)
@@ -0,0 +1,42 @@
+# tests/test_response_cache.py
+
+from app.response_cache import ResponseCache
+
+
+def test_body_reused_for_same_version():
+    cache = ResponseCache()
+    source = object()
+    assert cache.get("k", 1) is None
+    cache.set("k", 1, source, b"{}")
+    cached = cache.get("k", 1)
+    assert cached.body == b"{}"
+    assert cached.source is source
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_new_version_invalidates_body():
+    cache = ResponseCache()
+    cache.set("k", 1, object(), b"old")
+    assert cache.get("k", 2) is None
+    cache.set("k", (3, None), object(), b"new")
+    assert cache.get("k", (3, None)).body == b"new"
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", 1, object(), b"a")
+    cache.set("b", 1, object(), b"b")
+    cache.get("a", 1)
+    cache.set("c", 1, object(), b"c")
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1).body == b"a"
+    assert len(cache) == 2
+
+
+def test_etag_follows_body():
+    cache = ResponseCache()
+    first = cache.set("k", 1, object(), b"v1")
+    second = cache.set("k", 2, object(), b"v2")
+    assert first.etag != second.etag
+    assert cache.set("j", 1, object(), b"v1").etag == first.etag
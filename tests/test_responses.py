@@ -0,0 +1,57 @@
+# tests/test_responses.py
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.responses import JSONResponse
+
+from app import responses
+from app.response_cache import validator_headers
+from app.responses import (
+    ORJSONResponse,
+    conditional_response,
+    etag_matches,
+    json_response_class,
+)
+
+
+def test_stdlib_encoder_selected_by_name():
+    assert json_response_class("json") is JSONResponse
+
+
+def test_orjson_selected_when_installed():
+    pytest.importorskip("orjson")
+    assert json_response_class("orjson") is ORJSONResponse
+
+
+def test_falls_back_when_orjson_missing(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    assert json_response_class("orjson") is JSONResponse
+
+
+def test_unknown_encoder_rejected():
+    with pytest.raises(ValueError):
+        json_response_class("yaml")
+
+
+def test_orjson_body_matches_stdlib():
+    pytest.importorskip("orjson")
+    payload = {"lineup": ["Lebron James"], "avg_usage_rate": None, "games": 71}
+    assert ORJSONResponse(payload).body == JSONResponse(payload).body
+    assert json.loads(ORJSONResponse({"games": np.int64(71)}).body) == {"games": 71}
+
+
+def test_etag_matching():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"b", W/"a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_not_modified_response_has_no_body():
+    response = conditional_response(b"{}", '"a"', validator_headers('"a"', 0.0), '"a"')
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["last-modified"] == "Thu, 01 Jan 1970 00:00:00 GMT"
@@ -0,0 +1,104 @@
+# tests/test_retention.py
+
+from datetime import datetime, timedelta
+
+from app.db import (
+    INSERT_USAGE,
+    UPSERT_ROLLUP,
+    get_connection,
+    init_db,
+    rollup_counts,
+    usage_summary,
+)
+from app.retention import run_retention
+
+NOW = datetime(2024, 3, 1, 12)
+
+
+def log_at(path, timestamps):
+    # What UsageLogWriter does, with chosen timestamps
+    init_db(path)
+    rows = [(ts.isoformat(), "/player", "lebron-james") for ts in timestamps]
+    conn = get_connection(path)
+    with conn:
+        conn.executemany(INSERT_USAGE, rows)
+        conn.executemany(UPSERT_ROLLUP, rollup_counts(rows))
+    return conn
+
+
+def test_old_raw_rows_deleted_in_batches(tmp_path):
+    path = str(tmp_path / "usage.db")
+    old = [NOW - timedelta(days=10, minutes=i) for i in range(25)]
+    recent = [NOW - timedelta(hours=1)] * 5
+    conn = log_at(path, old + recent)
+
+    result = run_retention(path, raw_hours=24, batch_size=10, now=NOW)
+
+    assert result["raw_deleted"] == 25
+    assert conn.execute("SELECT COUNT(*) FROM usage_log").fetchone()[0] == 5
+    # Counts survive in the rollup
+    total = conn.execute("SELECT SUM(count) FROM usage_rollup").fetchone()[0]
+    assert total == 30
+
+
+def test_old_hourly_rollups_merged_into_days(tmp_path):
+    path = str(tmp_path / "usage.db")
+    old_day = [datetime(2024, 1, 5, hour) for hour in range(24)]
+    conn = log_at(path, old_day + [NOW])
+
+    result = run_retention(path, raw_hours=24, hourly_days=30, now=NOW)
+
+    assert result["hourly_merged"] == 24
+    buckets = conn.execute(
+        "SELECT bucket, count FROM usage_rollup ORDER BY bucket"
+    ).fetchall()
+    assert buckets == [("2024-01-05", 24), ("2024-03-01T12", 1)]
+    # A second pass has nothing left to do
+    assert run_retention(path, raw_hours=24, hourly_days=30, now=NOW) == {
+        "raw_deleted": 0,
+        "hourly_merged": 0,
+        "daily_deleted": 0,
+        "free_pages": result["free_pages"],
+    }
+
+
+def test_space_reclaimed_incrementally(tmp_path):
+    path = str(tmp_path / "usage.db")
+    conn = log_at(path, [NOW - timedelta(days=10)] * 20000)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    run_retention(path, raw_hours=24, batch_size=5000, now=NOW)
+
+    assert conn.execute("PRAGMA page_count").fetchone()[0] < pages / 2
+    # The rollup still counts the deleted rows
+    assert usage_summary(hours=24 * 30, path=path, now=NOW)["total"] == 20000
+
+
+def test_old_daily_rollups_deleted(tmp_path):
+    path = str(tmp_path / "usage.db")
+    conn = log_at(path, [datetime(2023, 1, 5, 9), datetime(2024, 1, 5, 9), NOW])
+
+    result = run_retention(path, raw_hours=24, hourly_days=30, daily_days=365, now=NOW)
+
+    assert result["hourly_merged"] == 2
+    assert result["daily_deleted"] == 1
+    buckets = conn.execute("SELECT bucket FROM usage_rollup ORDER BY bucket").fetchall()
+    assert buckets == [("2024-01-05",), ("2024-03-01T12",)]
+
+
+def test_summary_counts_merged_days(tmp_path):
+    path = str(tmp_path / "usage.db")
+    hours = [datetime(2024, 1, 5, 9), datetime(2024, 1, 5, 20)]
+    log_at(path, hours + [NOW - timedelta(hours=2)])
+    run_retention(path, raw_hours=24, hourly_days=30, now=NOW)
+
+    # The cutoff (2024-01-05T12) falls inside the merged day: count all of it
+    summary = usage_summary(hours=24 * 56, path=path, now=NOW)
+    assert summary["since"] == "2024-01-05T12"
+    assert summary["total"] == 3
+    assert summary["buckets"] == [
+        {"bucket": "2024-01-05", "resolution": "day", "count": 2},
+        {"bucket": "2024-03-01T10", "resolution": "hour", "count": 1},
+    ]
+    assert usage_summary(hours=24 * 55, path=path, now=NOW)["total"] == 1
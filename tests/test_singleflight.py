@@ -0,0 +1,97 @@
+# tests/test_singleflight.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+CALLERS = 32
+
+
+class SlowUpstream:
+    def __init__(self, delay=0.2, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, player_id):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"player_id": player_id, "points_per_game": 27.1}
+
+
+def run_concurrently(fn, n=CALLERS):
+    barrier = threading.Barrier(n)
+
+    def call():
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(call) for _ in range(n)]
+    return futures
+
+
+def test_concurrent_callers_share_one_fetch():
+    flight = SingleFlight()
+    upstream = SlowUpstream()
+
+    futures = run_concurrently(lambda: flight.do(2544, upstream, 2544))
+
+    assert upstream.calls == 1
+    results = [f.result() for f in futures]
+    assert all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+    upstream = SlowUpstream(error=ValueError("Insufficient data"))
+
+    futures = run_concurrently(lambda: flight.do(1, upstream, 1))
+
+    assert upstream.calls == 1
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+
+    upstream.error = None
+    assert flight.do(1, upstream, 1)["player_id"] == 1
+    assert upstream.calls == 2
+
+
+def test_distinct_keys_fetch_independently():
+    flight = SingleFlight()
+    upstream = SlowUpstream(delay=0.05)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda pid: flight.do(pid, upstream, pid), [1, 2, 3, 4]))
+
+    assert upstream.calls == 4
+
+
+def test_get_cached_player_stats_coalesces_misses(monkeypatch, season_totals):
+    from app import main
+
+    calls = []
+
+    def upstream(player_id, season):
+        calls.append(player_id)
+        time.sleep(0.2)
+        return season_totals
+
+    monkeypatch.setattr(main, "fetch_season_totals", upstream)
+    main.stats_cache.clear()
+    try:
+        futures = run_concurrently(lambda: main.get_cached_player_stats(-1))
+        assert calls == [-1]
+        assert all(f.result()["team"] == "LAL" for f in futures)
+    finally:
+        main.stats_cache.clear()
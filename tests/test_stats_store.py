@@ -0,0 +1,54 @@
+# tests/test_stats_store.py
+
+from app.cache import TTLCache
+from app.stats_store import LATEST_SEASON, StatsStore
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, player_id):
+        self.calls += 1
+        return {"points_per_game": 25.0 + self.calls, "team": "LAL"}
+
+
+def test_roundtrip(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    store.set((2544, "2023-24"), {"points_per_game": 25.7})
+
+    value, age = store.get((2544, "2023-24"))
+    assert value == {"points_per_game": 25.7}
+    assert age < 5
+    assert store.get((2544, "2022-23")) is None
+
+
+def test_restarted_cache_is_served_from_disk(tmp_path):
+    path = str(tmp_path / "stats.db")
+    key = (2544, LATEST_SEASON)
+    upstream = Upstream()
+
+    TTLCache(store=StatsStore(path)).get(key, upstream, 2544)
+    assert upstream.calls == 1
+
+    # A fresh worker: empty memory cache, same file
+    restarted = TTLCache(store=StatsStore(path))
+    assert restarted.get(key, upstream, 2544)["points_per_game"] == 26.0
+    assert upstream.calls == 1
+    assert restarted.stats()["store_hits"] == 1
+    assert restarted.get(key, upstream, 2544)["points_per_game"] == 26.0
+    assert restarted.stats()["hits"] == 1
+
+
+def test_stale_disk_entry_is_served_then_refreshed(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    key = (2544, LATEST_SEASON)
+    upstream = Upstream()
+    store.set(key, {"points_per_game": 20.0, "team": "CLE"})
+
+    cache = TTLCache(ttl=0, store=store)
+    assert cache.get(key, upstream, 2544)["team"] == "CLE"
+    cache._pool.shutdown(wait=True)
+
+    assert upstream.calls == 1
+    assert store.get(key)[0]["team"] == "LAL"
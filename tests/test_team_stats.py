@@ -0,0 +1,48 @@
+# tests/test_team_stats.py
+
+import pytest
+
+from app.ingest import ingest_season
+from app.league_store import LeagueStore
+from app.metrics import DerivedMetrics
+from app.team_stats import get_team_totals, player_usage_rate
+
+
+def test_usage_rate_from_player_and_team_totals():
+    store = LeagueStore()
+    ingest_season(store, "2023-24")
+
+    assert player_usage_rate(store.row(2544), "2023-24") == 28.7
+
+
+def test_team_totals_fetched_once_per_season():
+    teams = get_team_totals("2023-24")
+    assert get_team_totals("2023-24") is teams
+    assert len(teams) == 4
+
+
+def test_traded_player_uses_league_average_team():
+    teams = get_team_totals("2022-23")
+    minutes, possessions = teams.lookup(0)  # TOT row
+    assert minutes == pytest.approx(teams.minutes.mean())
+    assert possessions == pytest.approx(teams.possessions.mean())
+
+
+def test_vectorized_usage_matches_scalar():
+    store = LeagueStore()
+    ingest_season(store, "2022-23")
+    metrics = DerivedMetrics(store.snapshot, get_team_totals("2022-23"))
+
+    for player_id in (2544, 201939, 201142):
+        expected = player_usage_rate(store.row(player_id), "2022-23")
+        assert metrics.player(player_id)["usage_rate"] == expected
+
+
+def test_usage_is_none_without_team_totals():
+    store = LeagueStore()
+    ingest_season(store, "2023-24")
+    assert DerivedMetrics(store.snapshot).player(2544)["usage_rate"] is None
+
+
+def test_usage_is_none_for_untracked_turnovers(season_totals):
+    assert player_usage_rate(dict(season_totals, TOV=None), "2023-24") is None